@@ -185,9 +185,13 @@ TONE: VERY INFORMATIVE/EDUCATIONAL (Focus: Deep Knowledge)
     # Video settings
     MIN_VIDEO_LENGTH: int = 30
     MAX_VIDEO_LENGTH: int = 90
+    # libx264 preset used when no hardware encoder is available ("medium" trades speed for quality)
+    VIDEO_PRESET: str = "veryfast"
 
     # LLM Configuration
     OLLAMA_BASE_URL: str = "http://localhost:11434"
+    # Keep models loaded (and their prompt KV cache warm) between calls and retries
+    OLLAMA_KEEP_ALIVE: str = "30m"
 
 
 class ConfigManager:
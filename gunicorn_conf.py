@@ -0,0 +1,15 @@
+"""Gunicorn settings for serving the TikTok Creator web frontend"""
+
+import os
+
+bind = "0.0.0.0:5000"
+
+# Jobs, their progress and the worker pool live in-process, so keep a single
+# worker and let threads overlap status polls and downloads
+workers = 1
+worker_class = "gthread"
+threads = int(os.environ.get("RR_WEB_THREADS", "16"))
+
+# Downloads of finished videos can take a while on slow connections
+timeout = 120
+keepalive = 5
@@ -0,0 +1,29 @@
+"""JSON helpers for TikTok Creator - uses orjson when installed, stdlib json otherwise"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _stdlib_dumps(obj: Any) -> str:
+    # Anything json can't encode natively (sets, datetimes, tool objects) is written as str()
+    return json.dumps(obj, default=str)
+
+
+if orjson is not None:
+    json_loads = orjson.loads
+
+    def json_dumps(obj: Any) -> str:
+        """Serialize obj to a JSON string"""
+        try:
+            return orjson.dumps(obj).decode('utf-8')
+        except TypeError:
+            # e.g. sets, ints beyond 64 bit or non-str keys, which orjson rejects
+            return _stdlib_dumps(obj)
+else:
+    json_loads = json.loads
+    json_dumps = _stdlib_dumps
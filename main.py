@@ -54,6 +54,7 @@ def initialize_system() -> ManagerAgent:
         llm = OllamaLLM(
             model=temp_config.MANAGER_AGENT_MODEL,
             base_url=temp_config.OLLAMA_BASE_URL,
+            keep_alive=temp_config.OLLAMA_KEEP_ALIVE,
             timeout=60,
             temperature=0.7
         )
@@ -1,12 +1,13 @@
 """Manager Agent for TikTok Creator - FIXED with complete PDF mode support"""
 
 import json
+import os
 import time
 from typing import Dict, List, Any
 from langchain_ollama import OllamaLLM
 from langchain.agents import create_react_agent, AgentExecutor
 from langchain.prompts import PromptTemplate
-from config import config
+from config import config, ConfigManager
 from prompts import MANAGER_AGENT_PROMPT, GAIA_MANAGER_PROMPT, PDF_MANAGER_PROMPT
 from tools import (
     TrendAnalysisTool,
@@ -31,6 +32,7 @@ class ManagerAgent:
         self.llm = OllamaLLM(
             model=config.MANAGER_AGENT_MODEL,
             base_url=config.OLLAMA_BASE_URL,
+            keep_alive=config.OLLAMA_KEEP_ALIVE,
             timeout=60,
             temperature=0.3
         )
@@ -95,9 +97,14 @@ class ManagerAgent:
                 # For PDF mode, check if we have PDF content in config
                 pdf_path = config.settings.get('pdf_path')
                 if pdf_path:
-                    # Extract PDF content first
-                    pdf_tool = PDFExtractionTool()
-                    pdf_content = pdf_tool._extract_pdf_local(pdf_path)
+                    # Use the text extracted at upload time, extracting the PDF only when it is missing
+                    text_path = config.settings.get('pdf_text_path')
+                    if text_path and os.path.exists(text_path):
+                        with open(text_path, encoding='utf-8') as f:
+                            pdf_content = f.read()
+                    else:
+                        pdf_tool = PDFExtractionTool()
+                        pdf_content = pdf_tool._extract_pdf_local(pdf_path)
 
                     if pdf_content.startswith("Error"):
                         raise Exception(f"PDF extraction failed: {pdf_content}")
@@ -180,4 +187,15 @@ Focus on creating an engaging summary that transforms the academic/technical con
                 "topic": topic,
                 "mode": self.mode,
                 "error": str(e)
-            }
\ No newline at end of file
+            }
+
+def run_video_job(job_config, topic: str, mode: str = "tiktok") -> Dict[str, Any]:
+    """Create one video with the given job config in the current process (process pool entry point)"""
+    ConfigManager.set_config(job_config)
+    try:
+        result = ManagerAgent(mode=mode).create_viral_video(topic)
+    finally:
+        ConfigManager.clear_config()
+
+    # Only plain data goes back to the parent process
+    return {key: result[key] for key in ("status", "agent_output", "error") if key in result}
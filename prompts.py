@@ -1,10 +1,11 @@
 """All prompts for TikTok Creator agents - FIXED PDF Content Creation"""
 
 
-CONTENT_CREATION_PROMPT = '''Create a viral TikTok script about "{topic}".
+CONTENT_CREATION_PROMPT = '''Create a viral TikTok script about the topic below.
 
 {tone_modifier}
 
+TOPIC: "{topic}"
 TRENDING TOPICS: {trend_text}
 VIRAL KEYWORDS: {keyword_text}
 HOOK EXAMPLES: {hook_text}
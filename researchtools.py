@@ -1,13 +1,15 @@
 """Simplified Research Tools for Content Research Agent - Fixed circular import"""
 
-import json
 import time
 import re
+import hashlib
 import urllib.parse
 import xml.etree.ElementTree as ET
 import os
 import requests
 import tempfile
+import threading
+from itertools import islice
 from typing import Dict, List, Any, Optional
 from langchain_ollama import OllamaLLM
 from langchain.agents import create_react_agent, AgentExecutor
@@ -15,6 +17,7 @@ from langchain.prompts import PromptTemplate
 from langchain.tools import BaseTool
 from duckduckgo_search import DDGS
 from config import config
+from json_utils import json_dumps, json_loads
 from prompts import CONTENT_RESEARCH_AGENT_PROMPT
 from logger import performance_tracker
 import logging
@@ -30,6 +33,42 @@ except ImportError:
     except ImportError:
         PDF_LIB = None
 
+# DDGS clients are cached per thread and timeout so repeated searches reuse their HTTP connections
+_DDGS_CLIENTS = threading.local()
+
+
+def get_ddgs(timeout: int) -> DDGS:
+    """Return the calling thread's DDGS client for the given timeout, creating it on first use"""
+    clients = getattr(_DDGS_CLIENTS, "by_timeout", None)
+    if clients is None:
+        clients = _DDGS_CLIENTS.by_timeout = {}
+    client = clients.get(timeout)
+    if client is None:
+        client = clients[timeout] = DDGS(timeout=timeout)
+    return client
+
+# Extracted PDF text keyed by SHA-256 of the file, so the upload preview, the job runner
+# and the manager agent parse each document only once
+_PDF_TEXT_CACHE_SIZE = 32
+_PDF_TEXT_CACHE: Dict[str, str] = {}
+_PDF_TEXT_CACHE_LOCK = threading.Lock()
+
+
+def pdf_sha256(pdf_path: str) -> str:
+    """SHA-256 hex digest of a file, read in 1 MiB chunks"""
+    digest = hashlib.sha256()
+    with open(pdf_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+# Quoted facts, insights, and key points in research agent output
+_FINDING_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r'["\']([^"\']*(?:fact|research|study|shows|indicates)[^"\']*)["\']',
+    r'["\']([^"\']*\d+%[^"\']*)["\']',
+    r'["\']([^"\']*(?:expert|professor|scientist)[^"\']*)["\']'
+)]
+
 
 class PDFExtractionTool(BaseTool):
     """Tool for downloading and extracting text from PDF files"""
@@ -137,8 +176,8 @@ class PDFExtractionTool(BaseTool):
 
         return text.strip()
 
-    def _extract_pdf_local(self, pdf_path: str) -> str:
-        """Extract text from local PDF file"""
+    def _extract_pdf_local(self, pdf_path: str, sha256: Optional[str] = None) -> str:
+        """Extract text from local PDF file (pass sha256 when the file's digest is already known)"""
         logger = logging.getLogger('PDFExtractionTool')
         logger.info(f"Extracting text from local PDF: {pdf_path}")
 
@@ -149,6 +188,13 @@ class PDFExtractionTool(BaseTool):
             if not os.path.exists(pdf_path):
                 return f"Error: PDF file not found: {pdf_path}"
 
+            cache_key = sha256 or pdf_sha256(pdf_path)
+            with _PDF_TEXT_CACHE_LOCK:
+                cached = _PDF_TEXT_CACHE.get(cache_key)
+            if cached is not None:
+                logger.info(f"Using cached text for local PDF ({len(cached)} characters)")
+                return cached
+
             # Extract text using available library
             if PDF_LIB == "PyPDF2":
                 text = self._extract_with_pypdf2(pdf_path)
@@ -161,6 +207,11 @@ class PDFExtractionTool(BaseTool):
             if len(text) > 15000:
                 text = text[:15000] + "\n\n[Text truncated - showing first 15000 characters]"
 
+            with _PDF_TEXT_CACHE_LOCK:
+                if len(_PDF_TEXT_CACHE) >= _PDF_TEXT_CACHE_SIZE:
+                    _PDF_TEXT_CACHE.pop(next(iter(_PDF_TEXT_CACHE)), None)
+                _PDF_TEXT_CACHE[cache_key] = text
+
             return text
 
         except Exception as e:
@@ -190,7 +241,7 @@ class ArxivFullTextTool(BaseTool):
 
         except Exception as e:
             logger.error(f"ArXiv full text search failed: {e}")
-            return json.dumps({
+            return json_dumps({
                 "error": f"ArXiv full text search failed: {str(e)}",
                 "papers": []
             })
@@ -221,13 +272,13 @@ class ArxivFullTextTool(BaseTool):
             full_text = self._extract_pdf_text(pdf_url)
 
             if full_text.startswith("Error"):
-                return json.dumps({
+                return json_dumps({
                     "error": full_text,
                     "arxiv_id": arxiv_id,
                     "pdf_url": pdf_url
                 })
 
-            return json.dumps({
+            return json_dumps({
                 "arxiv_id": arxiv_id,
                 "title": metadata.get("title", "Unknown"),
                 "authors": metadata.get("authors", []),
@@ -240,7 +291,7 @@ class ArxivFullTextTool(BaseTool):
 
         except Exception as e:
             logger.error(f"Failed to get full text for {arxiv_id}: {e}")
-            return json.dumps({
+            return json_dumps({
                 "error": f"Failed to get full text: {str(e)}",
                 "arxiv_id": arxiv_id
             })
@@ -256,20 +307,20 @@ class ArxivFullTextTool(BaseTool):
 
             response = requests.get(search_url, timeout=15)
             if response.status_code != 200:
-                return json.dumps({"error": "ArXiv API unavailable", "papers": []})
+                return json_dumps({"error": "ArXiv API unavailable", "papers": []})
 
             # Parse search results
             papers = self._parse_search_results(response.text)
 
             if not papers:
-                return json.dumps({"error": "No papers found", "papers": []})
+                return json_dumps({"error": "No papers found", "papers": []})
 
             # Get full text of the first (most relevant) paper
             best_paper = papers[0]
             arxiv_id = best_paper.get("arxiv_id")
 
             if not arxiv_id:
-                return json.dumps({
+                return json_dumps({
                     "error": "Could not extract ArXiv ID from search results",
                     "papers": papers
                 })
@@ -279,7 +330,7 @@ class ArxivFullTextTool(BaseTool):
 
         except Exception as e:
             logger.error(f"Search and full text extraction failed: {e}")
-            return json.dumps({
+            return json_dumps({
                 "error": f"Search failed: {str(e)}",
                 "papers": []
             })
@@ -508,11 +559,11 @@ class WebSearchTool(BaseTool):
     def _run(self, query: str) -> str:
         try:
             time.sleep(1)
-            ddgs = DDGS(timeout=15)
+            ddgs = get_ddgs(15)
             results = list(ddgs.text(query, max_results=8))
 
             if not results:
-                return json.dumps({"error": "No results found", "results": []})
+                return json_dumps({"error": "No results found", "results": []})
 
             cleaned_results = []
             for result in results:
@@ -522,10 +573,10 @@ class WebSearchTool(BaseTool):
                     "url": result.get("href", "")
                 })
 
-            return json.dumps({"results": cleaned_results, "total": len(cleaned_results)})
+            return json_dumps({"results": cleaned_results, "total": len(cleaned_results)})
 
         except Exception as e:
-            return json.dumps({"error": f"Search failed: {str(e)}", "results": []})
+            return json_dumps({"error": f"Search failed: {str(e)}", "results": []})
 
 
 class ArxivSearchTool(BaseTool):
@@ -550,7 +601,7 @@ class ArxivSearchTool(BaseTool):
 
             if response.status_code != 200:
                 logger.error(f"ArXiv API returned status {response.status_code}")
-                return json.dumps({"error": "ArXiv API unavailable", "papers": []})
+                return json_dumps({"error": "ArXiv API unavailable", "papers": []})
 
             content = response.text
             logger.info(f"ArXiv content length: {len(content)}")
@@ -616,11 +667,11 @@ class ArxivSearchTool(BaseTool):
 
             result = {"papers": papers, "total": len(papers)}
             logger.info(f"ArXiv final result: {len(papers)} papers")
-            return json.dumps(result)
+            return json_dumps(result)
 
         except Exception as e:
             logger.error(f"ArXiv search failed completely: {e}")
-            return json.dumps({"error": f"ArXiv search failed: {str(e)}", "papers": []})
+            return json_dumps({"error": f"ArXiv search failed: {str(e)}", "papers": []})
 
 
 class YouTubeTranscriptTool(BaseTool):
@@ -632,7 +683,7 @@ class YouTubeTranscriptTool(BaseTool):
     def _run(self, query: str) -> str:
         try:
             # Search for YouTube videos first
-            ddgs = DDGS(timeout=10)
+            ddgs = get_ddgs(10)
             search_query = f"site:youtube.com {query}"
             results = list(ddgs.text(search_query, max_results=3))
 
@@ -656,10 +707,10 @@ class YouTubeTranscriptTool(BaseTool):
                             "url": url
                         })
 
-            return json.dumps({"transcripts": transcripts, "total": len(transcripts)})
+            return json_dumps({"transcripts": transcripts, "total": len(transcripts)})
 
         except Exception as e:
-            return json.dumps({"error": f"YouTube transcript failed: {str(e)}", "transcripts": []})
+            return json_dumps({"error": f"YouTube transcript failed: {str(e)}", "transcripts": []})
 
     def _get_video_info(self, video_id: str, result: dict) -> str:
         """Get available video information (description, etc.)"""
@@ -685,7 +736,7 @@ class WikipediaSearchTool(BaseTool):
 
             if response.status_code == 200:
                 data = response.json()
-                return json.dumps({
+                return json_dumps({
                     "title": data.get("title", ""),
                     "summary": data.get("extract", "")[:800],
                     "url": data.get("content_urls", {}).get("desktop", {}).get("page", ""),
@@ -702,16 +753,28 @@ class WikipediaSearchTool(BaseTool):
 
                     if results:
                         first_result = results[0]
-                        return json.dumps({
+                        return json_dumps({
                             "title": first_result.get("title", ""),
                             "summary": first_result.get("snippet", "")[:400],
                             "source": "Wikipedia"
                         })
 
-            return json.dumps({"error": "No Wikipedia results found"})
+            return json_dumps({"error": "No Wikipedia results found"})
 
         except Exception as e:
-            return json.dumps({"error": f"Wikipedia search failed: {str(e)}"})
+            return json_dumps({"error": f"Wikipedia search failed: {str(e)}"})
+
+
+# Research tools are stateless, so build them and their prompt strings once at import
+_RESEARCH_TOOLS = [
+    WebSearchTool(),
+    ArxivSearchTool(),
+    ArxivFullTextTool(),
+    YouTubeTranscriptTool(),
+    WikipediaSearchTool()
+]
+_RESEARCH_TOOL_DESC_STR = "\n".join([f"{tool.name}: {tool.description}" for tool in _RESEARCH_TOOLS])
+_RESEARCH_TOOL_NAMES_STR = ", ".join([tool.name for tool in _RESEARCH_TOOLS])
 
 
 class ContentResearchAgent:
@@ -721,16 +784,11 @@ class ContentResearchAgent:
         self.llm = OllamaLLM(
             model=config.CONTENT_RESEARCH_MODEL,
             base_url=config.OLLAMA_BASE_URL,
+            keep_alive=config.OLLAMA_KEEP_ALIVE,
             timeout=60,
             temperature=0.3
         )
-        self.tools = [
-            WebSearchTool(),
-            ArxivSearchTool(),
-            ArxivFullTextTool(),  # NEW: Added full text tool
-            YouTubeTranscriptTool(),
-            WikipediaSearchTool()
-        ]
+        self.tools = _RESEARCH_TOOLS
         self.agent_executor = self._create_agent_executor()
 
     def _create_agent_executor(self) -> AgentExecutor:
@@ -738,8 +796,8 @@ class ContentResearchAgent:
             template=CONTENT_RESEARCH_AGENT_PROMPT,
             input_variables=["input", "agent_scratchpad"],
             partial_variables={
-                "tools": "\n".join([f"{tool.name}: {tool.description}" for tool in self.tools]),
-                "tool_names": ", ".join([tool.name for tool in self.tools])
+                "tools": _RESEARCH_TOOL_DESC_STR,
+                "tool_names": _RESEARCH_TOOL_NAMES_STR
             }
         )
 
@@ -767,7 +825,7 @@ class ContentResearchAgent:
                 start = output_text.find('{')
                 end = output_text.rfind('}') + 1
                 if start != -1 and end > start:
-                    structured_data = json.loads(output_text[start:end])
+                    structured_data = json_loads(output_text[start:end])
                     return {
                         "status": "success",
                         "topic": topic,
@@ -805,25 +863,25 @@ class ContentResearchTool(BaseTool):
 
             if result["status"] == "success":
                 if "structured_data" in result:
-                    return json.dumps(result["structured_data"])
+                    return json_dumps(result["structured_data"])
                 else:
                     # Extract key information from output
                     output = result.get("research_output", "")
-                    return json.dumps({
+                    return json_dumps({
                         "research_summary": output[:800],
                         "key_findings": self._extract_findings(output),
                         "sources_used": ["web", "academic", "video", "encyclopedia"],
                         "agent_research": True
                     })
             else:
-                return json.dumps({
+                return json_dumps({
                     "error": result.get("error", "Research failed"),
                     "research_summary": "",
                     "key_findings": []
                 })
 
         except Exception as e:
-            return json.dumps({
+            return json_dumps({
                 "error": f"Research failed: {str(e)}",
                 "research_summary": "",
                 "key_findings": []
@@ -833,15 +891,8 @@ class ContentResearchTool(BaseTool):
         """Extract key findings from research output"""
         findings = []
 
-        # Look for facts, insights, and key points
-        patterns = [
-            r'["\']([^"\']*(?:fact|research|study|shows|indicates)[^"\']*)["\']',
-            r'["\']([^"\']*\d+%[^"\']*)["\']',
-            r'["\']([^"\']*(?:expert|professor|scientist)[^"\']*)["\']'
-        ]
-
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            findings.extend(matches[:3])
+        # Only the first 3 matches per pattern are kept, so stop scanning there
+        for pattern in _FINDING_PATTERNS:
+            findings.extend(match.group(1) for match in islice(pattern.finditer(text), 3))
 
-        return list(set(findings))[:8]
+        return list(dict.fromkeys(findings))[:8]
@@ -3,27 +3,256 @@
 import os
 import subprocess
 import random
-import json
 import time
 import asyncio
 import re
-import wave
+import hashlib
+import string
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any
 import edge_tts
 import vosk
 from langchain.tools import BaseTool
 from langchain_ollama import OllamaLLM
-from duckduckgo_search import DDGS
 
 import prompts
 from config import config
+from json_utils import json_dumps, json_loads
 from prompts import CONTENT_CREATION_PROMPT, PDF_CONTENT_CREATION_PROMPT
+from researchtools import get_ddgs
 from logger import performance_tracker
 import logging
 
 # Erstelle logs Ordner wenn nicht vorhanden
 os.makedirs('./logs', exist_ok=True)
 
+# Generated scripts keyed by the fully rendered prompt, so repeated topics skip the LLM call
+_SCRIPT_CACHE_SIZE = 64
+_SCRIPT_CACHE: "OrderedDict[str, str]" = OrderedDict()
+_SCRIPT_CACHE_LOCK = threading.Lock()
+
+
+def _script_cache_key(model: str, prompt: str, is_pdf: bool, tone_value: float) -> str:
+    """Build the prompt cache key for a script generation request"""
+    raw = f"{model}\0{is_pdf}\0{tone_value}\0{prompt}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def _compile_prompt(template: str) -> List[tuple]:
+    """Split a str.format template once into (literal, field_name) pairs"""
+    return [(literal, field) for literal, field, _, _ in string.Formatter().parse(template)]
+
+
+def _render_prompt(parts: List[tuple], **values) -> str:
+    """Fill a template compiled by _compile_prompt without re-parsing it"""
+    return "".join([literal if field is None else literal + str(values[field]) for literal, field in parts])
+
+
+_CONTENT_PROMPT_PARTS = _compile_prompt(CONTENT_CREATION_PROMPT)
+_PDF_CONTENT_PROMPT_PARTS = _compile_prompt(PDF_CONTENT_CREATION_PROMPT)
+
+
+# Common patterns for author names in academic papers
+_AUTHOR_PATTERNS = [re.compile(p, re.MULTILINE) for p in (
+    # "Author Name1, Author Name2" format
+    r'(?:Authors?|By):?\s*([A-Z][a-z]+ [A-Z][a-z]+(?:,\s*[A-Z][a-z]+ [A-Z][a-z]+)*)',
+    # Names at beginning of document
+    r'^([A-Z][a-z]+ [A-Z][a-z]+(?:,\s*[A-Z][a-z]+ [A-Z][a-z]+)*)',
+    # Names followed by affiliation patterns
+    r'([A-Z][a-z]+ [A-Z][a-z]+)(?:\s*[,\d]|\s*\n|\s*Department|\s*University|\s*Institute)',
+)]
+
+# Markdown code fences and newlines removed before retrying JSON extraction
+_JSON_FENCE_RE = re.compile(r'```json|```|\n')
+
+def _find_json_span(text: str) -> Optional[str]:
+    """Return the first balanced {...} object in text, ignoring braces inside JSON strings"""
+    start = text.find('{')
+    if start == -1:
+        return None
+
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+
+# Extracted authors keyed by a hash of the PDF header that _extract_author_names scans
+_PDF_AUTHOR_CACHE_SIZE = 128
+_PDF_AUTHOR_CACHE: Dict[str, tuple] = {}
+
+# Characters stripped from scripts before TTS
+_EMOJI_TABLE = str.maketrans('', '', '🔥😱🤯🚀💥⚡🌟✨💯🎯⏳✊🌱➡️📚#🌍🤫')
+_NON_SPEECH_CHARS = re.compile(r'[^\w\s.,!?-]')
+
+# Vosk model is loaded once per process and shared by all jobs
+_VOSK_MODEL_PATHS = [
+    "./vosk-model-small-en-us-0.15",
+    "./models/vosk-model-small-en-us-0.15",
+    "./vosk-model-en-us-0.22"
+]
+_VOSK_MODEL = None
+_VOSK_MODEL_LOCK = threading.Lock()
+
+
+def _get_vosk_model() -> Optional["vosk.Model"]:
+    """Load the first available Vosk model on first use and reuse it afterwards"""
+    global _VOSK_MODEL
+    if _VOSK_MODEL is not None:
+        return _VOSK_MODEL
+    with _VOSK_MODEL_LOCK:
+        if _VOSK_MODEL is None:
+            for path in _VOSK_MODEL_PATHS:
+                if os.path.exists(path):
+                    _VOSK_MODEL = vosk.Model(path)
+                    break
+        return _VOSK_MODEL
+
+
+# One long-lived event loop for edge-tts so narration calls don't build and tear down a loop each time.
+# Started on first use per process: a forked job worker inherits the loop but not the thread running it.
+_TTS_LOOP = None
+_TTS_LOOP_PID = None
+_TTS_LOOP_LOCK = threading.Lock()
+
+
+def _get_tts_loop() -> asyncio.AbstractEventLoop:
+    """This process's TTS event loop, started on first use"""
+    global _TTS_LOOP, _TTS_LOOP_PID
+    pid = os.getpid()
+    if _TTS_LOOP is not None and _TTS_LOOP_PID == pid:
+        return _TTS_LOOP
+    with _TTS_LOOP_LOCK:
+        if _TTS_LOOP is None or _TTS_LOOP_PID != pid:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="tts-event-loop", daemon=True).start()
+            _TTS_LOOP, _TTS_LOOP_PID = loop, pid
+        return _TTS_LOOP
+
+
+# H.264 encoders in order of preference; hardware encoders fall back to libx264.
+# NVENC uses constant-quality VBR at the same level as the libx264 CRF.
+_H264_ENCODERS = [
+    ["-c:v", "h264_nvenc", "-preset", "p4", "-rc", "vbr", "-cq", "23"],
+    ["-c:v", "h264_qsv", "-preset", "veryfast"],
+    ["-c:v", "h264_videotoolbox", "-b:v", "8M"],
+]
+_H264_ENCODER_ARGS = None
+_H264_ENCODER_LOCK = threading.Lock()
+
+
+def _get_h264_encoder_args() -> List[str]:
+    """Pick the first H.264 encoder that can actually encode on this machine, probed once per process"""
+    global _H264_ENCODER_ARGS
+    with _H264_ENCODER_LOCK:
+        if _H264_ENCODER_ARGS is None:
+            _H264_ENCODER_ARGS = [
+                "-c:v", "libx264", "-preset", config.VIDEO_PRESET, "-tune", "fastdecode",
+                "-crf", "23", "-threads", "0", "-pix_fmt", "yuv420p"
+            ]
+            for encoder_args in _H264_ENCODERS:
+                # Being listed by ffmpeg is not enough (e.g. nvenc without a GPU), so encode a test clip
+                try:
+                    probe = subprocess.run([
+                        "ffmpeg", "-hide_banner", "-loglevel", "error", "-f", "lavfi",
+                        "-i", "color=black:s=256x256:d=0.1", *encoder_args, "-f", "null", "-"
+                    ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=15)
+                except Exception:
+                    continue
+                if probe.returncode == 0:
+                    _H264_ENCODER_ARGS = encoder_args
+                    break
+            logging.getLogger('VideoProductionTool').info(f"Using video encoder: {_H264_ENCODER_ARGS[1]}")
+        return _H264_ENCODER_ARGS
+
+
+# Template and music listings, rescanned only when the directory mtime changes
+_VIDEO_EXTENSIONS = frozenset({'.mp4', '.avi', '.mov', '.mkv'})
+_MUSIC_EXTENSIONS = frozenset({'.mp3', '.wav', '.m4a', '.ogg'})
+_MEDIA_LISTING_CACHE: Dict[str, tuple] = {}
+
+
+def _list_media_files(directory: str, extensions: frozenset) -> List[str]:
+    """Return paths of files in directory whose extension is in extensions"""
+    mtime = os.stat(directory).st_mtime_ns
+    cached = _MEDIA_LISTING_CACHE.get(directory)
+    if cached is not None and cached[0] == mtime and cached[1] is extensions:
+        return cached[2]
+
+    with os.scandir(directory) as entries:
+        files = [entry.path for entry in entries
+                 if entry.is_file() and os.path.splitext(entry.name)[1].lower() in extensions]
+    _MEDIA_LISTING_CACHE[directory] = (mtime, extensions, files)
+    return files
+
+
+# Subtitle words ending with these are never merged with the next word
+_CHUNK_BREAK_PUNCTUATION = ('.', '!', '?', ',', ';', ':')
+
+
+# Content creation LLM clients shared by all tool instances, one per model/server
+_CONTENT_LLMS: Dict[tuple, OllamaLLM] = {}
+_CONTENT_LLMS_LOCK = threading.Lock()
+
+
+def _get_content_llm(strict_json: bool = False) -> OllamaLLM:
+    """Return the shared content creation LLM for the current config's model.
+
+    strict_json selects a low-temperature variant with Ollama's JSON output mode, used as the last retry.
+    """
+    key = (config.CONTENT_CREATION_MODEL, config.OLLAMA_BASE_URL, strict_json)
+    with _CONTENT_LLMS_LOCK:
+        llm = _CONTENT_LLMS.get(key)
+        if llm is None:
+            llm = _CONTENT_LLMS[key] = OllamaLLM(
+                model=config.CONTENT_CREATION_MODEL,
+                base_url=config.OLLAMA_BASE_URL,
+                keep_alive=config.OLLAMA_KEEP_ALIVE,
+                timeout=60,
+                temperature=0.2 if strict_json else 0.7,
+                format="json" if strict_json else ""
+            )
+        return llm
+
+
+def _prewarm_content_llm():
+    """Load the default content model into Ollama so the first script doesn't pay the cold start"""
+    try:
+        _get_content_llm().invoke("Respond with just 'READY'")
+    except Exception as e:
+        logging.getLogger('ContentCreationTool').warning(f"Content model prewarm failed: {e}")
+
+
+if os.environ.get("RR_PREWARM") == "1":
+    threading.Thread(target=_prewarm_content_llm, name="content-llm-prewarm", daemon=True).start()
+
+
+# Punctuation and digits dropped before splitting search snippets into keywords
+_KEYWORD_STRIP_TABLE = str.maketrans('', '', string.punctuation + string.digits)
+
+
+# Long-lived search workers, so each keeps its DDGS client (and connections) across trend analyses
+_TREND_SEARCH_EXECUTOR = ThreadPoolExecutor(max_workers=3, thread_name_prefix="trend-search")
+
 
 class TrendAnalysisTool(BaseTool):
     """LangChain tool for analyzing viral trends and getting trending topics via web search"""
@@ -36,31 +265,31 @@ class TrendAnalysisTool(BaseTool):
         logger.info(f"Analyzing trends for: {query}")
 
         try:
-            time.sleep(2)
-            ddgs = DDGS(timeout=20)
             search_queries = [
                 f"{query} trending 2025",
                 f"{query} viral content",
                 f"popular {query} topics"
             ]
 
+            # Run all searches at once; results are collected in query order
             all_results = []
-            for i, search_query in enumerate(search_queries):
-                try:
-                    if i > 0:
-                        time.sleep(3)
-                    results = list(ddgs.text(search_query, max_results=5))
-                    all_results.extend(results)
-                    if len(all_results) >= 10:
-                        break
-                except Exception as e:
-                    logger.warning(f"Search attempt {i + 1} failed: {e}")
-                    print(f"Search attempt {i + 1} failed: {e}")
-                    continue
+            futures = [_TREND_SEARCH_EXECUTOR.submit(self._search_with_retry, q) for q in search_queries]
+            try:
+                # Overall budget so one stuck or retrying query can't hold up the whole analysis
+                deadline = time.monotonic() + 30
+                for i, future in enumerate(futures):
+                    try:
+                        all_results.extend(future.result(timeout=max(0.0, deadline - time.monotonic())))
+                    except Exception as e:
+                        logger.warning(f"Search attempt {i + 1} failed: {e!r}")
+                        print(f"Search attempt {i + 1} failed: {e!r}")
+            finally:
+                for future in futures:
+                    future.cancel()
 
             if not all_results:
                 logger.error("No search results available")
-                return json.dumps({
+                return json_dumps({
                     "trending_topics": [],
                     "recommended_keywords": [],
                     "viral_scores": {},
@@ -69,18 +298,16 @@ class TrendAnalysisTool(BaseTool):
                 })
 
             trending_topics = []
-            keywords = []
+            keyword_counts = Counter()
 
+            # Rank keywords by how often they appear across results, ties keep first-seen order
             for result in all_results:
-                title_words = result["title"].lower().split()
-                snippet_words = result["body"][:200].lower().split()
-                all_words = title_words + snippet_words
-                filtered_words = [w for w in all_words if len(w) > 3 and w.isalpha()]
-                keywords.extend(filtered_words)
+                text = f"{result['title']} {result['body'][:200]}".lower().translate(_KEYWORD_STRIP_TABLE)
+                keyword_counts.update(w for w in text.split() if len(w) > 3 and w.isalpha())
                 if len(result["title"]) < 120:
                     trending_topics.append(result["title"])
 
-            unique_keywords = list(set(keywords))[:20]
+            unique_keywords = [w for w, _ in keyword_counts.most_common(20)]
             trending_topics = trending_topics[:10]
 
             result_data = {
@@ -91,11 +318,11 @@ class TrendAnalysisTool(BaseTool):
             }
 
             logger.info(f"Found {len(trending_topics)} trending topics and {len(unique_keywords)} keywords")
-            return json.dumps(result_data)
+            return json_dumps(result_data)
 
         except Exception as e:
             logger.error(f"Trend analysis failed: {e}")
-            return json.dumps({
+            return json_dumps({
                 "trending_topics": [],
                 "recommended_keywords": [],
                 "viral_scores": {},
@@ -103,6 +330,18 @@ class TrendAnalysisTool(BaseTool):
                 "error": f"Search failed: {str(e)}"
             })
 
+    def _search_with_retry(self, search_query: str, attempts: int = 3) -> List[Dict]:
+        """Run a single search, backing off only when the request fails (e.g. rate limits)"""
+        delay = 2
+        for attempt in range(attempts):
+            try:
+                return list(get_ddgs(20).text(search_query, max_results=5))
+            except Exception:
+                if attempt == attempts - 1:
+                    raise
+                time.sleep(delay)
+                delay *= 2
+
 
 # ContentResearchTool is imported from researchtools.py
 
@@ -114,19 +353,14 @@ class ContentCreationTool(BaseTool):
 
     def __init__(self):
         super().__init__()
-        self._llm = OllamaLLM(
-            model=config.CONTENT_CREATION_MODEL,
-            base_url=config.OLLAMA_BASE_URL,
-            timeout=60,
-            temperature=0.7
-        )
+        self._llm = _get_content_llm()
 
     @performance_tracker("ContentCreation")
     def _run(self, input_data: str) -> str:
         logger = logging.getLogger('ContentCreationTool')
 
         try:
-            data = json.loads(input_data)
+            data = json_loads(input_data)
             topic = data.get("topic", "")
 
             # FIXED: Check for PDF mode properly
@@ -146,7 +380,7 @@ class ContentCreationTool(BaseTool):
 
         except Exception as e:
             logger.error(f"Content creation tool failed: {e}")
-            return json.dumps({"error": f"Content creation tool failed: {str(e)}"})
+            return json_dumps({"error": f"Content creation tool failed: {str(e)}"})
 
     def _create_pdf_summary_script(self, data: Dict) -> str:
         """Create TikTok script specifically for PDF summarization"""
@@ -170,7 +404,8 @@ class ContentCreationTool(BaseTool):
             logger.info(f"Extracted authors: {', '.join(author_names)}")
 
         # FIXED: Use the correct PDF prompt with proper formatting
-        prompt = PDF_CONTENT_CREATION_PROMPT.format(
+        prompt = _render_prompt(
+            _PDF_CONTENT_PROMPT_PARTS,
             topic=topic,
             tone_modifier=tone_modifier,
             tone_description=tone_description,
@@ -183,25 +418,19 @@ class ContentCreationTool(BaseTool):
 
     def _extract_author_names(self, pdf_content: str) -> List[str]:
         """Extract potential author names from PDF content"""
-        import re
-
-        authors = []
-
-        # Common patterns for author names in academic papers
-        patterns = [
-            # "Author Name1, Author Name2" format
-            r'(?:Authors?|By):?\s*([A-Z][a-z]+ [A-Z][a-z]+(?:,\s*[A-Z][a-z]+ [A-Z][a-z]+)*)',
-            # Names at beginning of document
-            r'^([A-Z][a-z]+ [A-Z][a-z]+(?:,\s*[A-Z][a-z]+ [A-Z][a-z]+)*)',
-            # Names followed by affiliation patterns
-            r'([A-Z][a-z]+ [A-Z][a-z]+)(?:\s*[,\d]|\s*\n|\s*Department|\s*University|\s*Institute)',
-        ]
-
         # Look in first 1000 characters where authors are typically mentioned
         text_start = pdf_content[:1000]
 
-        for pattern in patterns:
-            matches = re.findall(pattern, text_start, re.MULTILINE)
+        # Same document re-run with other settings: skip the regex passes
+        cache_key = hashlib.blake2b(text_start.encode('utf-8')).hexdigest()
+        cached = _PDF_AUTHOR_CACHE.get(cache_key)
+        if cached is not None:
+            return list(cached)
+
+        authors = []
+
+        for pattern in _AUTHOR_PATTERNS:
+            matches = pattern.findall(text_start)
             for match in matches:
                 # Split by comma and clean up
                 names = [name.strip() for name in match.split(',')]
@@ -214,7 +443,11 @@ class ContentCreationTool(BaseTool):
                         authors.append(name)
 
         # Limit to first 3 authors to keep it concise
-        return authors[:3]
+        authors = authors[:3]
+        if len(_PDF_AUTHOR_CACHE) >= _PDF_AUTHOR_CACHE_SIZE:
+            _PDF_AUTHOR_CACHE.pop(next(iter(_PDF_AUTHOR_CACHE)), None)
+        _PDF_AUTHOR_CACHE[cache_key] = tuple(authors)
+        return authors
 
     def _create_regular_script(self, data: Dict) -> str:
         """Create regular TikTok script for trending topics"""
@@ -233,7 +466,8 @@ class ContentCreationTool(BaseTool):
         hook_text = " | ".join(hooks[:5]) if hooks else ""
         format_text = " | ".join(formats[:4]) if formats else ""
 
-        prompt = CONTENT_CREATION_PROMPT.format(
+        prompt = _render_prompt(
+            _CONTENT_PROMPT_PARTS,
             topic=topic,
             tone_modifier=tone_modifier,
             tone_description=tone_description,
@@ -249,43 +483,54 @@ class ContentCreationTool(BaseTool):
         """Generate script using the LLM with the given prompt"""
         logger = logging.getLogger('ContentCreationTool')
 
+        cache_key = _script_cache_key(self._llm.model, prompt, is_pdf, config.TONE_VALUE)
+        with _SCRIPT_CACHE_LOCK:
+            cached = _SCRIPT_CACHE.get(cache_key)
+            if cached is not None:
+                _SCRIPT_CACHE.move_to_end(cache_key)
+        if cached is not None:
+            logger.info("Script served from prompt cache")
+            return cached
+
         for attempt in range(3):
+            # Each retry pushes harder for valid JSON: an explicit reminder, then JSON mode at low temperature
+            if attempt > 0:
+                time.sleep(0.5 * (1 << attempt))
+            llm = _get_content_llm(strict_json=True) if attempt == 2 else self._llm
+            attempt_prompt = prompt if attempt == 0 else f"{prompt}\n\nRespond ONLY with JSON."
             try:
-                response = self._llm.invoke(prompt)
+                response = llm.invoke(attempt_prompt)
                 content = self._extract_json(response)
                 if content:
                     validated_content = self._validate_content(content, tone_description, is_pdf)
                     content_type = "PDF summary" if is_pdf else "regular content"
                     logger.info(
                         f"Script generated successfully for {content_type} with tone: {validated_content.get('tone_applied', 'unknown')}")
-                    return json.dumps(validated_content)
+                    script_json = json_dumps(validated_content)
+                    with _SCRIPT_CACHE_LOCK:
+                        _SCRIPT_CACHE[cache_key] = script_json
+                        if len(_SCRIPT_CACHE) > _SCRIPT_CACHE_SIZE:
+                            _SCRIPT_CACHE.popitem(last=False)
+                    return script_json
                 else:
                     if attempt == 2:
                         logger.error("Failed to generate valid JSON after 3 attempts")
-                        return json.dumps({"error": "Failed to generate valid JSON after 3 attempts"})
+                        return json_dumps({"error": "Failed to generate valid JSON after 3 attempts"})
             except Exception as e:
                 if attempt == 2:
                     logger.error(f"Content generation failed: {e}")
-                    return json.dumps({"error": f"Content generation failed: {str(e)}"})
+                    return json_dumps({"error": f"Content generation failed: {str(e)}"})
 
     def _extract_json(self, response: str) -> Optional[Dict]:
         """Extract JSON from LLM response"""
-        start = response.find('{')
-        end = response.rfind('}') + 1
-        if start != -1 and end > start:
-            try:
-                return json.loads(response[start:end])
-            except:
-                pass
-
-        cleaned = re.sub(r'```json|```|\n', '', response)
-        start = cleaned.find('{')
-        end = cleaned.rfind('}') + 1
-        if start != -1 and end > start:
-            try:
-                return json.loads(cleaned[start:end])
-            except:
-                pass
+        # Retry with code fences and raw newlines stripped, which fixes most malformed replies
+        for text in (response, _JSON_FENCE_RE.sub('', response)):
+            span = _find_json_span(text)
+            if span:
+                try:
+                    return json_loads(span)
+                except ValueError:
+                    pass
         return None
 
     def _validate_content(self, content: Dict, tone_description: str, is_pdf: bool = False) -> Dict[str, Any]:
@@ -335,19 +580,25 @@ class VideoProductionTool(BaseTool):
         logger.info("Starting video production")
 
         try:
-            data = json.loads(input_data)
+            data = json_loads(input_data)
             script_text = data.get("script_text", "")
             video_length = data.get("video_length", 35)
 
             if not script_text:
                 logger.error("No script text provided")
-                return json.dumps({"error": "No script text provided"})
+                return json_dumps({"error": "No script text provided"})
 
-            logger.info("Creating narration")
-            narration_path = self._create_narration(script_text)
+            # Template scan and Vosk model load don't depend on the narration, so overlap them with TTS.
+            # Narration stays on this thread because output paths come from the thread's job config.
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                template_future = executor.submit(self._select_template)
+                executor.submit(_get_vosk_model)
 
-            logger.info("Selecting video template")
-            template_path = self._select_template()
+                logger.info("Creating narration")
+                narration_path = self._create_narration(script_text)
+
+                logger.info("Selecting video template")
+                template_path = template_future.result()
 
             logger.info("Creating video with subtitles")
             final_video = self._create_video_with_subtitles(
@@ -362,80 +613,86 @@ class VideoProductionTool(BaseTool):
             }
 
             logger.info(f"Video production completed: {final_video}")
-            return json.dumps(result)
+            return json_dumps(result)
 
         except Exception as e:
             logger.error(f"Video production failed: {e}")
-            return json.dumps({"error": f"Video production failed: {str(e)}"})
+            return json_dumps({"error": f"Video production failed: {str(e)}"})
 
     def _create_narration(self, script_text: str) -> str:
-        text = re.sub(r'[🔥😱🤯🚀💥⚡🌟✨💯🎯⏳✊🌱➡️📚#🌍🤫]', '', script_text)
-        text = re.sub(r'[^\w\s.,!?-]', '', text).strip()
+        text = script_text.translate(_EMOJI_TABLE)
+        text = _NON_SPEECH_CHARS.sub('', text).strip()
 
         if not text:
             raise Exception("No valid text for TTS after cleaning")
 
-        os.makedirs(os.path.dirname(config.AUDIO_OUTPUT_PATH), exist_ok=True)
+        # Resolve the job's config here: the coroutine runs on the TTS loop thread, which has none
+        out_path = config.AUDIO_OUTPUT_PATH
+        os.makedirs(os.path.dirname(out_path), exist_ok=True)
         voice = random.choice(["en-US-AriaNeural", "en-US-JennyNeural", "en-US-GuyNeural"])
 
-        async def create_audio():
+        async def create_audio(text: str, voice: str, out_path: str):
             communicate = edge_tts.Communicate(text, voice, rate="+15%")
-            await communicate.save(config.AUDIO_OUTPUT_PATH)
+            await communicate.save(out_path)
 
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        loop.run_until_complete(create_audio())
-        loop.close()
+        future = asyncio.run_coroutine_threadsafe(create_audio(text, voice, out_path), _get_tts_loop())
+        try:
+            future.result(timeout=60)
+        except Exception:
+            future.cancel()
+            raise
 
-        if not os.path.exists(config.AUDIO_OUTPUT_PATH) or os.path.getsize(config.AUDIO_OUTPUT_PATH) <= 1000:
+        if not os.path.exists(out_path) or os.path.getsize(out_path) <= 1000:
             raise Exception("TTS failed to generate valid audio file")
 
-        return config.AUDIO_OUTPUT_PATH
+        return out_path
 
     def _select_template(self) -> str:
         if not os.path.exists(config.VIDEO_TEMPLATES_DIR):
             raise Exception(f"Video templates directory does not exist: {config.VIDEO_TEMPLATES_DIR}")
 
-        video_files = [f for f in os.listdir(config.VIDEO_TEMPLATES_DIR)
-                       if f.lower().endswith(('.mp4', '.avi', '.mov', '.mkv'))]
+        video_files = _list_media_files(config.VIDEO_TEMPLATES_DIR, _VIDEO_EXTENSIONS)
 
         if not video_files:
             raise Exception(f"No video template files found in {config.VIDEO_TEMPLATES_DIR}")
 
-        return os.path.join(config.VIDEO_TEMPLATES_DIR, random.choice(video_files))
+        return random.choice(video_files)
 
     def _create_video_with_subtitles(self, video_path: str, script_text: str,
                                      narration_path: str, target_duration: int) -> str:
         os.makedirs(os.path.dirname(config.FINAL_OUTPUT_PATH), exist_ok=True)
         subtitles = self._generate_vosk_subtitles(narration_path, script_text)
 
-        os.makedirs(os.path.dirname(config.SCRIPT_OUTPUT_PATH), exist_ok=True)
-        with open(config.SCRIPT_OUTPUT_PATH, 'w', encoding='utf-8') as f:
+        script_path = config.SCRIPT_OUTPUT_PATH
+        os.makedirs(os.path.dirname(script_path), exist_ok=True)
+        with open(script_path, 'w', encoding='utf-8') as f:
             f.write(subtitles)
 
-        safe_dir = "./temp_srt"
-        safe_path = "./temp_srt/subs.srt"
-        os.makedirs(safe_dir, exist_ok=True)
-        with open(safe_path, 'w', encoding='utf-8') as f:
-            f.write(subtitles)
+        # ffmpeg filter syntax needs forward slashes and escaped colons (Windows drive letters)
+        filter_srt_path = os.path.abspath(script_path).replace('\\', '/').replace(':', '\\:')
 
         abs_video = os.path.abspath(video_path)
         abs_output = os.path.abspath(config.FINAL_OUTPUT_PATH)
         abs_audio = os.path.abspath(narration_path)
 
-        cmd = [
-            "ffmpeg", "-y", "-i", abs_video, "-i", abs_audio, "-vf",
-            "subtitles='temp_srt/subs.srt':force_style='Fontsize=24,Bold=0,Outline=3,Shadow=2,Alignment=2,PrimaryColour=&H0000FFFF,OutlineColour=&H00000000,MarginV=80'",
-            "-c:v", "libx264", "-map", "0:v", "-map", "1:a", "-preset", "fast", "-shortest", abs_output
-        ]
+        subtitle_filter = f"subtitles='{filter_srt_path}':force_style='Fontsize=24,Bold=0,Outline=3,Shadow=2,Alignment=2,PrimaryColour=&H0000FFFF,OutlineColour=&H00000000,MarginV=80'"
+        encoder_args = _get_h264_encoder_args()
 
-        result = subprocess.run(cmd, capture_output=True, timeout=180)
+        def build_cmd(cuda_decode: bool) -> List[str]:
+            # With NVENC, decode on the GPU too and only download frames for the libass subtitle burn
+            input_args = ["-hwaccel", "cuda", "-hwaccel_output_format", "cuda"] if cuda_decode else []
+            video_filter = f"hwdownload,format=nv12,{subtitle_filter},hwupload_cuda" if cuda_decode else subtitle_filter
+            return [
+                "ffmpeg", "-y", "-loglevel", "error", "-nostats", *input_args, "-i", abs_video, "-i", abs_audio,
+                "-vf", video_filter, *encoder_args, "-map", "0:v", "-map", "1:a", "-movflags", "+faststart", "-shortest", abs_output
+            ]
 
-        try:
-            os.remove(safe_path)
-            os.rmdir(safe_dir)
-        except:
-            pass
+        result = None
+        if "h264_nvenc" in encoder_args:
+            result = subprocess.run(build_cmd(True), stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=180)
+        if result is None or result.returncode != 0:
+            # Templates the CUDA decoder can't handle (e.g. 10-bit) go through the CPU path
+            result = subprocess.run(build_cmd(False), stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=180)
 
         if result.returncode != 0 or not os.path.exists(abs_output):
             error_msg = result.stderr.decode('utf-8', errors='ignore')[
@@ -445,108 +702,92 @@ class VideoProductionTool(BaseTool):
         return abs_output
 
     def _generate_vosk_subtitles(self, narration_path: str, script_text: str) -> str:
-        temp_wav = "./output/temp_vosk.wav"
-        os.makedirs(os.path.dirname(temp_wav), exist_ok=True)
+        # Decode the narration straight to 16kHz mono PCM on ffmpeg's stdout; the model loads meanwhile
+        convert = subprocess.Popen([
+            "ffmpeg", "-loglevel", "error", "-i", narration_path,
+            "-ar", "16000", "-ac", "1", "-f", "s16le", "-"
+        ], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
 
-        result = subprocess.run([
-            "ffmpeg", "-y", "-i", narration_path,
-            "-ar", "16000", "-ac", "1", "-f", "wav", temp_wav
-        ], capture_output=True)
-
-        if result.returncode != 0:
+        try:
+            model = _get_vosk_model()
+            if not model:
+                raise Exception("No Vosk model found. Download from https://alphacephei.com/vosk/models")
+
+            rec = vosk.KaldiRecognizer(model, 16000)
+            rec.SetWords(True)
+            words_with_time = []
+
+            # ~2s of 16-bit 16kHz audio per read; Vosk word dicts already carry word/start/end
+            while True:
+                data = convert.stdout.read(64000)
+                if len(data) == 0:
+                    break
+                # Result() must still be collected per utterance (Vosk discards it on the next chunk),
+                # but utterances without recognised words are skipped without decoding
+                if rec.AcceptWaveform(data):
+                    raw_result = rec.Result()
+                    if '"result"' in raw_result:
+                        words_with_time.extend(json_loads(raw_result)["result"])
+        except Exception:
+            convert.kill()
+            convert.wait()
+            raise
+        finally:
+            convert.stdout.close()
+
+        if convert.wait() != 0:
             raise Exception("Failed to convert audio for Vosk processing")
 
-        model_paths = [
-            "./vosk-model-small-en-us-0.15",
-            "./models/vosk-model-small-en-us-0.15",
-            "./vosk-model-en-us-0.22"
-        ]
-
-        model = None
-        for path in model_paths:
-            if os.path.exists(path):
-                model = vosk.Model(path)
-                break
-
-        if not model:
-            raise Exception("No Vosk model found. Download from https://alphacephei.com/vosk/models")
-
-        rec = vosk.KaldiRecognizer(model, 16000)
-        rec.SetWords(True)
-        wf = wave.open(temp_wav, 'rb')
-        words_with_time = []
-
-        while True:
-            data = wf.readframes(4000)
-            if len(data) == 0:
-                break
-            if rec.AcceptWaveform(data):
-                result = json.loads(rec.Result())
-                if "result" in result:
-                    words_with_time.extend([
-                        {"word": w["word"], "start": w["start"], "end": w["end"]}
-                        for w in result["result"]
-                    ])
-
-        final = json.loads(rec.FinalResult())
-        if "result" in final:
-            words_with_time.extend([
-                {"word": w["word"], "start": w["start"], "end": w["end"]}
-                for w in final["result"]
-            ])
-
-        wf.close()
-        os.remove(temp_wav)
+        raw_final = rec.FinalResult()
+        if '"result"' in raw_final:
+            words_with_time.extend(json_loads(raw_final)["result"])
 
         if not words_with_time:
             raise Exception("Vosk detected no words with timestamps")
 
         word_chunks = self._create_vosk_chunks(words_with_time)
 
-        srt = ""
+        srt_parts = []
         for i, chunk in enumerate(word_chunks, 1):
-            srt += f"{i}\n{self._format_time(chunk['start'])} --> {self._format_time(chunk['end'])}\n<font color='#FFFF00'>{chunk['text']}</font>\n\n"
+            srt_parts.append(f"{i}\n{self._format_time(chunk['start'])} --> {self._format_time(chunk['end'])}\n<font color='#FFFF00'>{chunk['text']}</font>\n\n")
 
-        return srt.strip()
+        return "".join(srt_parts).strip()
 
     def _create_vosk_chunks(self, words_with_time: List[Dict]) -> List[Dict]:
         chunks = []
+        append = chunks.append
+        count = len(words_with_time)
         i = 0
 
-        while i < len(words_with_time):
+        while i < count:
             current = words_with_time[i]
             current_word = current["word"]
             current_length = len(current_word)
 
-            if current_word.endswith(('.', '!', '?', ',', ';', ':')) or current_length > 7:
-                chunks.append({"text": current_word, "start": current["start"], "end": current["end"]})
-                i += 1
-                continue
-
-            next_word = words_with_time[i + 1] if i + 1 < len(words_with_time) else None
-            if next_word:
+            # Short words are paired with a short follower; long or punctuated words stand alone
+            if (current_length <= 5 and i + 1 < count
+                    and not current_word.endswith(_CHUNK_BREAK_PUNCTUATION)):
+                next_word = words_with_time[i + 1]
                 next_word_text = next_word["word"]
-                if current_length <= 5 and len(next_word_text) <= 5:
-                    chunks.append({
+                if len(next_word_text) <= 5:
+                    append({
                         "text": f"{current_word} {next_word_text}",
                         "start": current["start"],
                         "end": next_word["end"]
                     })
                     i += 2
-                else:
-                    chunks.append({"text": current_word, "start": current["start"], "end": current["end"]})
-                    i += 1
-            else:
-                chunks.append({"text": current_word, "start": current["start"], "end": current["end"]})
-                i += 1
+                    continue
+
+            append({"text": current_word, "start": current["start"], "end": current["end"]})
+            i += 1
 
         return chunks
 
     def _format_time(self, seconds: float) -> str:
-        h = int(seconds // 3600)
-        m = int((seconds % 3600) // 60)
-        s = int(seconds % 60)
-        ms = int((seconds % 1) * 1000)
+        # Work in whole milliseconds so the float is only touched once
+        s, ms = divmod(round(seconds * 1000), 1000)
+        m, s = divmod(s, 60)
+        h, m = divmod(m, 60)
         return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
 
 
@@ -561,12 +802,12 @@ class MusicMatchingTool(BaseTool):
         logger.info("Adding background music")
 
         try:
-            data = json.loads(input_data)
+            data = json_loads(input_data)
             video_path = data.get("video_path", "")
 
             if not os.path.exists(video_path):
                 logger.error(f"Video file not found: {video_path}")
-                return json.dumps({"error": "Video file not found"})
+                return json_dumps({"error": "Video file not found"})
 
             logger.info("Selecting music")
             music_path = self._select_music()
@@ -581,11 +822,11 @@ class MusicMatchingTool(BaseTool):
             }
 
             logger.info(f"Music added successfully: {final_video}")
-            return json.dumps(result)
+            return json_dumps(result)
 
         except Exception as e:
             logger.error(f"Music matching failed: {e}")
-            return json.dumps({"error": f"Music matching failed: {str(e)}"})
+            return json_dumps({"error": f"Music matching failed: {str(e)}"})
 
     def _select_music(self) -> str:
         music_dir = "./music/viral"
@@ -593,13 +834,12 @@ class MusicMatchingTool(BaseTool):
         if not os.path.exists(music_dir):
             raise Exception(f"Music directory {music_dir} does not exist")
 
-        music_files = [f for f in os.listdir(music_dir)
-                       if f.lower().endswith(('.mp3', '.wav', '.m4a', '.ogg'))]
+        music_files = _list_media_files(music_dir, _MUSIC_EXTENSIONS)
 
         if not music_files:
             raise Exception(f"No music files found in {music_dir}")
 
-        return os.path.join(music_dir, random.choice(music_files))
+        return random.choice(music_files)
 
     def _add_music_to_video(self, video_path: str, music_path: str) -> str:
         """Add music to video with unique output filename"""
@@ -608,13 +848,13 @@ class MusicMatchingTool(BaseTool):
         output_path = os.path.join(os.path.dirname(video_path), f"{base_name}_with_music.mp4")
 
         cmd = [
-            "ffmpeg", "-y", "-i", video_path, "-i", music_path,
+            "ffmpeg", "-y", "-loglevel", "error", "-nostats", "-i", video_path, "-i", music_path,
             "-filter_complex", "[1:a]volume=0.2[music];[0:a][music]amix=inputs=2:duration=shortest[out]",
             "-map", "0:v", "-map", "[out]", "-c:v", "copy", "-c:a", "aac",
-            "-shortest", output_path
+            "-movflags", "+faststart", "-shortest", output_path
         ]
 
-        result = subprocess.run(cmd, capture_output=True, timeout=180)
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=180)
 
         if result.returncode != 0 or not os.path.exists(output_path):
             error_msg = result.stderr.decode('utf-8', errors='ignore')[
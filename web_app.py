@@ -1,47 +1,179 @@
 """Web Frontend for TikTok Creator - FIXED PDF Integration"""
 
 import os
+import hashlib
+import heapq
+import multiprocessing
+import re
 import subprocess
 import time
 import threading
+import unicodedata
 import uuid
-from flask import Flask, render_template, request, jsonify, send_file
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from itertools import islice
+from urllib.parse import quote
+from flask import Flask, render_template, request, jsonify, send_file, make_response
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from datetime import datetime
 from typing import Dict
 import logging
 
+import requests
+from requests.adapters import HTTPAdapter
 from werkzeug.utils import secure_filename
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 from researchtools import PDFExtractionTool, PDF_LIB
 # Import config with integrated ConfigManager
 from config import Config, ConfigManager
-from manager import ManagerAgent
+from manager import ManagerAgent, run_video_job
+
+
+class ReelRushJSONProvider(DefaultJSONProvider):
+    """JSON provider that serializes through orjson when installed and writes datetimes as ISO 8601"""
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, datetime):
+            return o.isoformat()
+        return DefaultJSONProvider.default(o)
+
+    def dumps(self, obj, **kwargs) -> str:
+        if orjson is not None:
+            try:
+                return orjson.dumps(obj, default=self.default).decode('utf-8')
+            except TypeError:
+                # e.g. ints beyond 64 bit or non-str keys in user supplied settings
+                pass
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if orjson is not None:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
 
 app = Flask(__name__)
+app.json = ReelRushJSONProvider(app)
 CORS(app)
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 app.config['PDF_UPLOAD_FOLDER'] = './uploads/pdfs'
+# Behind Apache/lighttpd, let the front server send the video bytes itself
+app.config['USE_X_SENDFILE'] = os.environ.get("RR_X_SENDFILE") == "1"
 
 # Configure logging for web app
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger('WebFrontend')
 
-# Store video creation jobs
+# Keep-alive connection to Ollama for the model list, which is cached briefly
+_OLLAMA_SESSION = requests.Session()
+_OLLAMA_SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+_OLLAMA_MODELS_TTL = 30
+_ollama_models_cache = None  # (expires at, response payload)
+
+# Longest a /api/status long poll may wait for a job change, in seconds
+_LONG_POLL_MAX_WAIT = 30
+
+# Uploads are copied to disk in chunks of this size
+_UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Behind nginx, an internal location aliased to ./output (e.g. "/protected/") that serves downloads
+_ACCEL_REDIRECT_PREFIX = os.environ.get("RR_ACCEL_REDIRECT_PREFIX")
+
+# Fallback video lookup: output directory listings keyed by the directory's st_mtime_ns
+_output_scan_cache = {}
+_output_scan_lock = threading.Lock()
+
+# Store video creation jobs, in creation order
 video_jobs = {}
+video_jobs_lock = threading.RLock()  # reentrant: jobs are submitted (and may finish) while it is held
+_MAX_JOBS = int(os.environ.get("RR_MAX_STORED_JOBS", "500"))
+
+# Jobs run on a bounded pool; extra submissions wait in its queue instead of each getting a thread
+_MAX_CONCURRENT_JOBS = int(os.environ.get("RR_MAX_JOBS", "2"))
+_JOB_EXECUTOR = ThreadPoolExecutor(max_workers=_MAX_CONCURRENT_JOBS, thread_name_prefix="video-job")
+_job_futures = {}  # job_id -> Future of jobs queued or running on _JOB_EXECUTOR
+# New jobs are refused with 503 while this many are already waiting for a worker
+_MAX_QUEUED_JOBS = int(os.environ.get("RR_MAX_QUEUED_JOBS", "10"))
+
+# With RR_JOB_PROCESSES > 0 the agent pipeline itself runs in worker processes, so its
+# Python-side CPU work doesn't share the GIL with request handling. Workers are never
+# forked from this multi-threaded process (a child could inherit a held lock): they come
+# from a forkserver where available, spawn otherwise, and start at manager.run_video_job.
+_JOB_PROCESSES = int(os.environ.get("RR_JOB_PROCESSES", "0"))
+_RENDER_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+_RENDER_EXECUTOR = ProcessPoolExecutor(
+    max_workers=_JOB_PROCESSES, mp_context=multiprocessing.get_context(_RENDER_START_METHOD)
+) if _JOB_PROCESSES > 0 else None
+
+# Finished jobs as (completed_at, job_id), oldest first, so cleanup only touches expired entries
+_expiry_heap = []
+_JOB_MAX_AGE = 3600  # 1 hour
+_CLEANUP_INTERVAL = 300
+_CLEANUP_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="cleanup-io")
+_cleanup_wakeup = threading.Event()  # set to run the cleanup loop ahead of schedule
+
+# Set when a job starts simulated progress, to wake the shared progress thread
+_progress_wakeup = threading.Event()
+
+# Finished jobs are snapshotted here so status and downloads survive a restart
+_JOBS_STATE_PATH = "./output/jobs.json"
+_jobs_state_lock = threading.Lock()
+
+# Characters dropped from topics when naming downloads (keeps letters, digits, space, - and _)
+_UNSAFE_FILENAME_CHARS = re.compile(r'[^\w \-]+')
+
+# Identical topic requests (same topic, tone bucket and models) share one render:
+# in-flight ones by job id, finished ones by video path (most recent last)
+_inflight_topics = {}
+_finished_topics = OrderedDict()
+_FINISHED_TOPICS_SIZE = 128
+
+# Text files written at upload, keyed by the uploaded PDF's real path (most recent last)
+_pdf_text_paths = OrderedDict()
+_pdf_text_paths_lock = threading.Lock()
+_PDF_TEXT_PATHS_SIZE = 256
+
+# Where the agent output mentions the finished video; one group per form, in order of preference
+_VIDEO_PATH_RE = re.compile(
+    r'"video_with_music":\s*"([^"]+)"'
+    r'|"video_path":\s*"([^"]+)"'
+    r'|Video:\s*([^\s]+\.mp4)'
+    r'|File:\s*([^\s]+\.mp4)'
+)
+
+# Created once here; request handlers assume these directories exist
 try:
     os.makedirs(app.config['PDF_UPLOAD_FOLDER'], exist_ok=True)
+    os.makedirs("./output", exist_ok=True)
     print(f"✅ PDF upload directory created: {app.config['PDF_UPLOAD_FOLDER']}")
 except Exception as e:
     print(f"❌ Failed to create PDF upload directory: {e}")
 
 
+# Log entries kept per job; older ones are dropped
+_MAX_JOB_LOGS = 500
+
+
 class VideoCreationJob:
     """Manages a single video creation job with enhanced settings"""
 
+    __slots__ = ("job_id", "topic", "settings", "status", "progress", "video_path", "error",
+                 "created_at", "completed_at", "current_stage", "_log_times", "_log_messages", "_log_offset",
+                 "_updated", "_json_cache", "_version", "_topic_key", "_download_filename",
+                 "_stages", "_stage_index", "_stages_started", "_stage_max_wait", "_next_stage_at")
+
     def __init__(self, job_id: str, topic: str, settings: Dict = None):
+        object.__setattr__(self, '_updated', threading.Condition())  # notified on every change
+        object.__setattr__(self, '_version', 0)
         self.job_id = job_id
         self.topic = topic
         self.settings = settings or {}
@@ -51,15 +183,61 @@ class VideoCreationJob:
         self.error = None
         self.created_at = datetime.now()
         self.completed_at = None
-        self.logs = []
         self.current_stage = ""
+        # The last _MAX_JOB_LOGS log entries as parallel lists of unix times and messages;
+        # _log_offset counts dropped entries, so log indices stay absolute
+        self._log_times = []
+        self._log_messages = []
+        self._log_offset = 0
+        self._json_cache = None  # (version, serialized to_dict)
+        self._topic_key = None
+        self._download_filename = None
+        # Simulated progress: (progress, stage) steps advanced by the shared progress thread
+        self._stages = ()
+        self._stage_index = 0
+        self._stages_started = 0.0
+        self._stage_max_wait = 0.0
+        self._next_stage_at = 0.0
+
+    def __setattr__(self, name, value):
+        # Any public field change invalidates the cached JSON and wakes event streams
+        object.__setattr__(self, name, value)
+        if not name.startswith('_'):
+            self._changed()
+
+    def _changed(self):
+        with self._updated:
+            object.__setattr__(self, '_version', self._version + 1)
+            self._updated.notify_all()
+
+    def wait_for_change(self, version: int, timeout: float) -> int:
+        """Block until the job's version differs from `version` (or timeout) and return the current one"""
+        with self._updated:
+            self._updated.wait_for(lambda: self._version != version, timeout)
+            return self._version
+
+    @property
+    def download_filename(self) -> str:
+        """Attachment name for the finished video, built on first use"""
+        if self._download_filename is None:
+            self._download_filename = _build_download_filename(self)
+        return self._download_filename
+
+    @property
+    def log_count(self) -> int:
+        """Number of log entries ever added, including dropped ones"""
+        return self._log_offset + len(self._log_messages)
 
     def add_log(self, message: str):
-        """Add a log message with timestamp"""
-        self.logs.append({
-            "timestamp": datetime.now().isoformat(),
-            "message": message
-        })
+        """Add a log message with timestamp, dropping the oldest past _MAX_JOB_LOGS"""
+        with self._updated:
+            self._log_times.append(time.time())
+            self._log_messages.append(message)
+            if len(self._log_messages) > _MAX_JOB_LOGS:
+                del self._log_times[0]
+                del self._log_messages[0]
+                self._log_offset += 1
+            self._changed()
 
     def update_progress(self, stage: str, progress: int):
         """Update progress and current stage"""
@@ -67,8 +245,42 @@ class VideoCreationJob:
         self.progress = progress
         self.add_log(f"{stage}")
 
-    def to_dict(self) -> Dict:
-        """Convert job to dictionary for JSON response"""
+    def start_stages(self, stages: list, max_wait: float):
+        """Simulate progress through `stages` over roughly two minutes, at most `max_wait` seconds apart"""
+        self._stages = stages
+        self._stage_index = 0
+        self._stages_started = time.monotonic()
+        self._stage_max_wait = max_wait
+        self._next_stage_at = self._stage_due(self._stages_started)
+        _progress_wakeup.set()
+
+    def _stage_due(self, last_update: float) -> float:
+        target_progress = self._stages[self._stage_index][0]
+        # Proportional to an assumed 2 minute run, but never more than max_wait after the last step
+        return min(self._stages_started + (target_progress / 100) * 120, last_update + self._stage_max_wait)
+
+    def stop_stages(self):
+        """End the simulation; once this returns the progress thread won't touch the job again"""
+        with self._updated:
+            self._stages = ()
+
+    def advance_stages(self, now: float) -> float:
+        """Apply the simulated stage due at `now`; return when the next one is due (inf if none)"""
+        # Under the job's lock, so a runner calling stop_stages() can't be overwritten afterwards
+        with self._updated:
+            if self.status != "processing" or self._stage_index >= len(self._stages):
+                return float('inf')
+            if now >= self._next_stage_at:
+                target_progress, stage = self._stages[self._stage_index]
+                self._stage_index += 1
+                self.update_progress(stage, target_progress)
+                if self._stage_index >= len(self._stages):
+                    return float('inf')
+                self._next_stage_at = self._stage_due(now)
+            return self._next_stage_at
+
+    def to_summary_dict(self) -> Dict:
+        """Job fields without the logs, for listings"""
         return {
             "job_id": self.job_id,
             "topic": self.topic,
@@ -78,73 +290,464 @@ class VideoCreationJob:
             "current_stage": self.current_stage,
             "video_path": self.video_path,
             "error": self.error,
-            "created_at": self.created_at.isoformat(),
-            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
-            "logs": self.logs
+            "created_at": self.created_at,
+            "completed_at": self.completed_at,
+            "logs_next": self.log_count
         }
 
+    def to_dict(self, since: int = 0) -> Dict:
+        """Convert job to dictionary for JSON response, with the retained logs from index `since` on"""
+        data = self.to_summary_dict()
+        with self._updated:
+            start = max(since - self._log_offset, 0)
+            times = self._log_times[start:]
+            messages = self._log_messages[start:]
+            log_count = self.log_count
+        data["logs"] = [
+            {"timestamp": datetime.fromtimestamp(ts), "message": message}
+            for ts, message in zip(times, messages)
+        ]
+        data["logs_next"] = log_count
+        return data
+
+    def to_json(self) -> str:
+        """Serialized to_dict(), rebuilt only when the job changed since the last call"""
+        version = self._version
+        cached = self._json_cache
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        serialized = app.json.dumps(self.to_dict())
+        self._json_cache = (version, serialized)
+        return serialized
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'VideoCreationJob':
+        """Rebuild a job saved with to_dict()"""
+        job = cls(data["job_id"], data["topic"], data.get("settings"))
+        job.status = data["status"]
+        job.progress = data["progress"]
+        job.current_stage = data.get("current_stage", "")
+        job.video_path = data.get("video_path")
+        job.error = data.get("error")
+        job.created_at = datetime.fromisoformat(data["created_at"])
+        job.completed_at = datetime.fromisoformat(data["completed_at"]) if data.get("completed_at") else None
+        for log in data.get("logs", []):
+            job._log_times.append(datetime.fromisoformat(log["timestamp"]).timestamp())
+            job._log_messages.append(log["message"])
+        return job
+
+
+def _build_download_filename(job: VideoCreationJob) -> str:
+    """Generate filename based on topic, settings and creation time"""
+    safe_topic = _UNSAFE_FILENAME_CHARS.sub('', job.topic).rstrip()
+    safe_topic = safe_topic[:50]  # Limit length
+    timestamp = job.created_at.strftime("%Y%m%d_%H%M%S")
+
+    # Add tone and model info to filename
+    tone_value = job.settings.get('tone', 0.5)
+    tone_suffix = "humorous" if tone_value < 0.5 else "informative"
+
+    # Add model info if custom models are used
+    models = job.settings.get('models', {})
+    custom_models = {k: v for k, v in models.items() if v not in ['gemma3:12b', 'qwen3:30b']}
+    model_suffix = ""
+    if custom_models:
+        model_names = [v.split(':')[0] for v in custom_models.values()]
+        model_suffix = f"_{'_'.join(set(model_names))}"
+
+    return f"tiktok_{safe_topic}_{tone_suffix}{model_suffix}_{timestamp}.mp4"
+
+
+def _tone_bucket(tone_value: float) -> int:
+    """Map a tone value (0.0-1.0) to one of five buckets, from very humorous (0) to very informative (4)"""
+    return min(max(int(tone_value * 5), 0), 4)
+
+
+def _save_finished_jobs():
+    """Write finished jobs to _JOBS_STATE_PATH so they survive a restart"""
+    with video_jobs_lock:
+        finished = [job for job in video_jobs.values() if job.completed_at]
+
+    with _jobs_state_lock:
+        try:
+            os.makedirs(os.path.dirname(_JOBS_STATE_PATH), exist_ok=True)
+            temp_path = f"{_JOBS_STATE_PATH}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(app.json.dumps([job.to_dict() for job in finished]))
+            os.replace(temp_path, _JOBS_STATE_PATH)
+        except Exception as e:
+            logger.error(f"Failed to save job state: {e}")
+
+
+def _load_finished_jobs():
+    """Restore the finished jobs saved by a previous run that haven't expired yet"""
+    if not os.path.exists(_JOBS_STATE_PATH):
+        return
+
+    try:
+        with open(_JOBS_STATE_PATH, 'r', encoding='utf-8') as f:
+            saved = app.json.loads(f.read())
+        current_time = datetime.now()
+        for data in saved:
+            job = VideoCreationJob.from_dict(data)
+            if (current_time - job.completed_at).total_seconds() <= _JOB_MAX_AGE:
+                video_jobs[job.job_id] = job
+                heapq.heappush(_expiry_heap, (job.completed_at, job.job_id))
+        logger.info(f"Restored {len(video_jobs)} finished jobs from {_JOBS_STATE_PATH}")
+    except Exception as e:
+        logger.error(f"Failed to restore job state: {e}")
+
+
+def _get_job(job_id: str):
+    """Look up a job under the store lock (plain dict reads aren't enough without the GIL)"""
+    with video_jobs_lock:
+        return video_jobs.get(job_id)
+
+
+def _store_job(job: VideoCreationJob):
+    """Add a job to video_jobs, evicting the oldest finished job past _MAX_JOBS (hold video_jobs_lock)"""
+    video_jobs[job.job_id] = job
+    if len(video_jobs) <= _MAX_JOBS:
+        return
+
+    oldest = next((old for old in video_jobs.values() if old.completed_at), None)
+    if oldest is None:
+        return
+    del video_jobs[oldest.job_id]
+    _release_video(oldest.video_path)
+
+
+def _release_video(video_path: str) -> bool:
+    """Queue a removed job's video for deletion unless a stored job still uses it (hold video_jobs_lock)"""
+    # Reused videos are shared between jobs; only delete files no stored job points at
+    if not video_path or any(job.video_path == video_path for job in video_jobs.values()):
+        return False
+    for topic_key in [key for key, path in _finished_topics.items() if path == video_path]:
+        del _finished_topics[topic_key]
+    _CLEANUP_EXECUTOR.submit(_remove_video_file, video_path)
+    return True
 
-def create_enhanced_prompt_modifier(tone_value: float) -> str:
-    """Create prompt modifier based on tone setting"""
-    if tone_value < 0.2:
-        return """
-TONE MODIFIER - VERY HUMOROUS/MEMEY:
-- Use lots of internet slang, memes, and trending phrases
-- Include emojis and expressive language
-- Focus on entertainment over education
-- Use humor, jokes, and funny comparisons
-- Reference popular culture and viral trends
-- Make it shareable and relatable
-- Priority: Fun and engagement over facts
-"""
-    elif tone_value < 0.4:
-        return """
-TONE MODIFIER - HUMOROUS:
-- Balance entertainment with some useful info
-- Use casual, friendly language with humor
-- Include some memes and trending references
-- Make facts entertaining and easy to digest
-- Use engaging storytelling with funny elements
-- Priority: 70% entertainment, 30% information
-"""
-    elif tone_value < 0.6:
-        return """
-TONE MODIFIER - BALANCED:
-- Mix entertainment and information equally
-- Use conversational but informative tone
-- Include both fun facts and useful information
-- Make content engaging but educational
-- Use relatable examples and moderate humor
-- Priority: 50% entertainment, 50% information
-"""
-    elif tone_value < 0.8:
-        return """
-TONE MODIFIER - INFORMATIVE:
-- Focus on providing valuable information
-- Use clear, educational language
-- Include facts, tips, and useful insights
-- Make content authoritative but accessible
-- Use professional but engaging tone
-- Priority: 70% information, 30% entertainment
-"""
+
+def _schedule_expiry(job: VideoCreationJob):
+    """Queue a finished job for removal once it is older than _JOB_MAX_AGE"""
+    if job.completed_at:
+        with video_jobs_lock:
+            heapq.heappush(_expiry_heap, (job.completed_at, job.job_id))
+        _save_finished_jobs()
+
+
+def _remove_video_file(video_path: str):
+    """Delete a video file if it still exists"""
+    try:
+        os.remove(video_path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.error(f"Failed to delete {video_path}: {e}")
+
+
+def _expire_old_jobs() -> tuple:
+    """Remove jobs (and their videos) that finished more than _JOB_MAX_AGE ago"""
+    current_time = datetime.now()
+    expired = []
+
+    with video_jobs_lock:
+        while _expiry_heap and (current_time - _expiry_heap[0][0]).total_seconds() > _JOB_MAX_AGE:
+            _, job_id = heapq.heappop(_expiry_heap)
+            job = video_jobs.pop(job_id, None)
+            if job:
+                expired.append(job)
+
+        # Delete video files off the caller's thread; the count is of files queued for deletion
+        files_queued = sum(_release_video(path) for path in {job.video_path for job in expired})
+
+    if expired:
+        _save_finished_jobs()
+
+    return files_queued, len(expired)
+
+
+def _cleanup_loop():
+    """Expire old jobs periodically, or as soon as /api/cleanup asks"""
+    while True:
+        _cleanup_wakeup.wait(_CLEANUP_INTERVAL)
+        _cleanup_wakeup.clear()
+        try:
+            cleaned, removed = _expire_old_jobs()
+            if removed:
+                logger.info(f"Cleaned up {removed} old jobs and {cleaned} videos")
+        except Exception as e:
+            logger.error(f"Periodic cleanup failed: {e}")
+
+
+def _progress_loop():
+    """Advance the simulated progress of all processing jobs from one thread"""
+    while True:
+        with video_jobs_lock:
+            jobs = list(video_jobs.values())
+
+        now = time.monotonic()
+        next_due = min((job.advance_stages(now) for job in jobs), default=float('inf'))
+
+        # Sleep until the next stage is due, or until a job starts new stages
+        _progress_wakeup.wait(None if next_due == float('inf') else max(next_due - time.monotonic(), 0))
+        _progress_wakeup.clear()
+
+
+# Render worker processes re-import this module as __mp_main__ when the app was started with
+# `python web_app.py`; they only run manager.run_video_job, so they skip the web-side state
+if __name__ != "__mp_main__":
+    _load_finished_jobs()
+    threading.Thread(target=_cleanup_loop, name="job-cleanup", daemon=True).start()
+    threading.Thread(target=_progress_loop, name="job-progress", daemon=True).start()
+
+
+def _resolve_uploaded_pdf(pdf_path: str):
+    """Real path of a PDF inside the upload folder, or None for anything else"""
+    real_path = os.path.realpath(pdf_path)
+    upload_root = os.path.realpath(app.config['PDF_UPLOAD_FOLDER'])
+    try:
+        if os.path.commonpath([real_path, upload_root]) != upload_root:
+            return None
+    except ValueError:  # different drives on Windows
+        return None
+    if not real_path.lower().endswith('.pdf') or not os.path.isfile(real_path):
+        return None
+    return real_path
+
+
+def _remember_pdf_text(pdf_path: str, text_path: str):
+    """Record where an uploaded PDF's extracted text was saved"""
+    real_path = os.path.realpath(pdf_path)
+    with _pdf_text_paths_lock:
+        _pdf_text_paths[real_path] = text_path
+        _pdf_text_paths.move_to_end(real_path)
+        if len(_pdf_text_paths) > _PDF_TEXT_PATHS_SIZE:
+            _pdf_text_paths.popitem(last=False)
+
+
+def _topic_key(topic: str, settings: Dict) -> tuple:
+    """Key under which requests for the same video are coalesced"""
+    return (topic.lower(), _tone_bucket(settings.get('tone', 0.5)),
+            tuple(sorted(settings.get('models', {}).items())))
+
+
+def _remember_video(job: VideoCreationJob):
+    """Record a finished topic video so identical requests can reuse it"""
+    with video_jobs_lock:
+        _finished_topics[job._topic_key] = job.video_path
+        _finished_topics.move_to_end(job._topic_key)
+        if len(_finished_topics) > _FINISHED_TOPICS_SIZE:
+            _finished_topics.popitem(last=False)
+
+
+def _video_path_from_output(output_text: str):
+    """Return the preferred existing video path mentioned in agent output, scanning it once"""
+    mentions = ([], [], [], [])
+    for match in _VIDEO_PATH_RE.finditer(output_text):
+        mentions[match.lastindex - 1].append(match.group(match.lastindex))
+
+    # Agents repeat the same path; stat each distinct one once
+    missing = set()
+    for paths in mentions:
+        for path in reversed(paths):  # Check latest mentions first
+            if path in missing:
+                continue
+            if os.path.exists(path):
+                return path
+            missing.add(path)
+    return None
+
+
+def _scan_output_videos(output_dir: str) -> list:
+    """(has music, path) for each MP4 in output_dir, relisted only when the directory changes"""
+    # Only names are cached: rewriting a file in place doesn't touch the directory's mtime
+    dir_mtime = os.stat(output_dir).st_mtime_ns
+    with _output_scan_lock:
+        cached = _output_scan_cache.get(output_dir)
+        if cached and cached[0] == dir_mtime:
+            return cached[1]
+
+    videos = []
+    with os.scandir(output_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith('.mp4') and entry.is_file():
+                videos.append(('music' in entry.name, entry.path))
+
+    with _output_scan_lock:
+        _output_scan_cache[output_dir] = (dir_mtime, videos)
+    return videos
+
+
+def _newest_output_video(since: float, output_dir: str = "./output"):
+    """Newest MP4 in output_dir modified at or after `since` (unix time), preferring files with music"""
+    try:
+        videos = _scan_output_videos(output_dir)
+    except FileNotFoundError:
+        return None
+    best = None
+    for has_music, path in videos:
+        try:
+            mtime = os.stat(path).st_mtime
+        except FileNotFoundError:
+            continue
+        # Sort key: prefer files with 'music' in name, then by newest
+        key = (has_music, mtime)
+        if mtime >= since and (best is None or key > best[0]):
+            best = (key, path)
+    return best[1] if best else None
+
+
+def _known_video_path(job_config: Config):
+    """Return the video the pipeline wrote for this job's config, preferring the version with music"""
+    final_path = job_config.FINAL_OUTPUT_PATH
+    base_name = os.path.splitext(final_path)[0]
+    for candidate in (f"{base_name}_with_music.mp4", final_path):
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def _submit_job(job: VideoCreationJob, mode: str):
+    """Queue a job on the bounded job pool, keeping its future until it finishes"""
+    future = _JOB_EXECUTOR.submit(_run_job, job, mode)
+    with video_jobs_lock:
+        _job_futures[job.job_id] = future
+    future.add_done_callback(lambda _: _forget_job_future(job.job_id))
+    return future
+
+
+def _forget_job_future(job_id: str):
+    with video_jobs_lock:
+        _job_futures.pop(job_id, None)
+
+
+def _queued_job_count() -> int:
+    """Jobs submitted to the pool that are still waiting for a worker"""
+    return _JOB_EXECUTOR._work_queue.qsize()
+
+
+def _queue_full_response():
+    """503 telling the client to retry once the job queue has drained"""
+    response = jsonify({"error": "Too many videos are queued, please try again in a few minutes"})
+    response.status_code = 503
+    response.headers['Retry-After'] = '60'
+    return response
+
+
+# Simulated progress stages per pipeline; {focus} and {style} follow the tone setting
+STAGES_TOPIC = (
+    (15, "Starting multi-agent workflow"),
+    (25, "Analyzing viral trends ({focus})"),
+    (35, "Searching for trending topics"),
+    (45, "Researching content ideas"),
+    (55, "Creating {style} script"),
+    (65, "Generating AI narration"),
+    (75, "Processing video templates"),
+    (85, "Adding dynamic subtitles"),
+    (92, "Adding background music"),
+    (95, "Finalizing video")
+)
+
+STAGES_PDF = (
+    (30, "Analyzing PDF content structure"),
+    (40, "Identifying key concepts and themes"),
+    (50, "Creating engaging summary script"),
+    (60, "Generating AI narration"),
+    (70, "Processing video templates"),
+    (80, "Adding dynamic subtitles"),
+    (90, "Adding background music"),
+    (95, "Finalizing PDF summary video")
+)
+
+
+def _find_video_path(job_config: Config, result: Dict, creation_timestamp: float):
+    """Locate the video a finished pipeline produced, or None"""
+    # Start with the paths this job's config told the tools to write
+    video_path = _known_video_path(job_config)
+
+    if not video_path and result.get("status") == "success":
+        # Look for video paths in the agent output
+        video_path = _video_path_from_output(result.get("agent_output", ""))
+
+    # If not found in output, check output directory
+    if not video_path:
+        video_path = _newest_output_video(creation_timestamp)
+
+    return video_path
+
+
+def _prepare_topic_job(job: VideoCreationJob):
+    """Log the tone the topic pipeline will use"""
+    tone_value = job.settings.get('tone', 0.5)
+    job.add_log(f"Applying tone setting: {tone_value:.1f} ({'Humorous' if tone_value < 0.5 else 'Informative'})")
+
+
+def _prepare_pdf_job(job: VideoCreationJob):
+    """Check the job's PDF and extract its text before the pipeline starts"""
+    pdf_path = job.settings.get('pdf_path')
+    if not pdf_path or not os.path.exists(pdf_path):
+        raise Exception("PDF file not found in job settings")
+
+    job.update_progress("Extracting text from PDF", 20)
+
+    # Reuse the text saved at upload time; the manager agent reads the same file
+    text_path = job.settings.get('pdf_text_path')
+    if text_path and os.path.exists(text_path):
+        with open(text_path, encoding='utf-8') as f:
+            extracted_text = f.read()
     else:
-        return """
-TONE MODIFIER - VERY INFORMATIVE/EDUCATIONAL:
-- Focus entirely on educational content
-- Use professional, authoritative language
-- Include detailed facts, statistics, and insights
-- Prioritize accuracy and depth of information
-- Use academic or expert-level explanations
-- Minimize entertainment elements
-- Priority: 90% information, 10% engagement
-"""
-
-
-def create_video_with_progress(job: VideoCreationJob):
-    """Create video with manual progress tracking and enhanced settings"""
+        pdf_tool = PDFExtractionTool()
+        extracted_text = pdf_tool._extract_pdf_local(pdf_path)
+
+        if extracted_text.startswith("Error"):
+            raise Exception(f"PDF extraction failed: {extracted_text}")
+
+    job.add_log(f"Extracted {len(extracted_text)} characters from PDF")
+
+
+def _topic_job_summary(job: VideoCreationJob) -> str:
+    tone_value = job.settings.get('tone', 0.5)
+    return f"Tone: {'Humorous' if tone_value < 0.5 else 'Informative'} ({tone_value:.1f})"
+
+
+def _pdf_job_summary(job: VideoCreationJob) -> str:
+    return f"Source: {os.path.basename(job.settings.get('pdf_path', ''))}"
+
+
+# Everything that differs between the topic and PDF pipelines, keyed by manager mode
+_JOB_PIPELINES = {
+    "tiktok": {
+        "starting": "Initializing TikTok Creator with custom settings",
+        "ready": "System initialized",
+        "prepare": _prepare_topic_job,
+        "stages": STAGES_TOPIC,
+        "max_wait": 10,
+        "completed": "Video completed!",
+        "summary": _topic_job_summary,
+        "missing": "Video file not found after creation",
+        "failed": "Video creation failed",
+    },
+    "pdf": {
+        "starting": "Initializing PDF video creation",
+        "ready": "PDF analysis system initialized",
+        "prepare": _prepare_pdf_job,
+        "stages": STAGES_PDF,
+        "max_wait": 8,
+        "completed": "PDF video completed!",
+        "summary": _pdf_job_summary,
+        "missing": "PDF video file not found after creation",
+        "failed": "PDF video creation failed",
+    },
+}
+
+
+def _run_job(job: VideoCreationJob, mode: str = "tiktok"):
+    """Create a job's video with the given pipeline, tracking progress on the job"""
+    pipeline = _JOB_PIPELINES[mode]
     try:
         job.status = "initializing"
-        job.update_progress("Initializing TikTok Creator with custom settings", 5)
+        job.update_progress(pipeline["starting"], 5)
 
         # Create a unique config for this job using the topic and settings
         job_config = Config(topic=job.topic, job_id=job.job_id, settings=job.settings)
@@ -153,129 +756,74 @@ def create_video_with_progress(job: VideoCreationJob):
         ConfigManager.set_config(job_config)
 
         # Initialize manager with unique config
-        manager = ManagerAgent()
-        job.update_progress("System initialized", 10)
+        manager = ManagerAgent(mode=mode) if _RENDER_EXECUTOR is None else None
+        job.update_progress(pipeline["ready"], 10)
 
         job.status = "processing"
-        creation_timestamp = datetime.now()
+        creation_timestamp = time.time()
 
-        # Apply tone settings to the manager/prompts
-        tone_value = job.settings.get('tone', 0.5)
-        tone_modifier = create_enhanced_prompt_modifier(tone_value)
-
-        job.add_log(f"Applying tone setting: {tone_value:.1f} ({'Humorous' if tone_value < 0.5 else 'Informative'})")
+        pipeline["prepare"](job)
 
         # Simulate progress based on expected timing
-        def simulate_progress():
-            stages = [
-                (15, "Starting multi-agent workflow"),
-                (25, f"Analyzing viral trends ({'humor-focused' if tone_value < 0.5 else 'info-focused'})"),
-                (35, "Searching for trending topics"),
-                (45, "Researching content ideas"),
-                (55, f"Creating {'entertaining' if tone_value < 0.5 else 'informative'} script"),
-                (65, "Generating AI narration"),
-                (75, "Processing video templates"),
-                (85, "Adding dynamic subtitles"),
-                (92, "Adding background music"),
-                (95, "Finalizing video")
-            ]
-
-            start = time.time()
-            for target_progress, stage in stages:
-                if job.status != "processing":
-                    break
-                # Wait proportionally (assume 2 minutes total)
-                wait_time = (target_progress / 100) * 120 - (time.time() - start)
-                if wait_time > 0:
-                    time.sleep(min(wait_time, 10))  # Max 10 seconds between updates
-                if job.status == "processing":
-                    job.update_progress(stage, target_progress)
-
-        # Start progress simulation in background
-        progress_thread = threading.Thread(target=simulate_progress)
-        progress_thread.daemon = True
-        progress_thread.start()
-
-        # Actually create the video (no need to modify topic here, tools will use config settings)
+        humorous = job.settings.get('tone', 0.5) < 0.5
+        job.start_stages([
+            (progress, stage.format(focus='humor-focused' if humorous else 'info-focused',
+                                    style='entertaining' if humorous else 'informative'))
+            for progress, stage in pipeline["stages"]
+        ], max_wait=pipeline["max_wait"])
+
+        # Actually create the video (tools read the topic, settings and PDF path from the config)
         start_time = time.time()
-        result = manager.create_viral_video(job.topic)
+        if manager is not None:
+            result = manager.create_viral_video(job.topic)
+        else:
+            result = _RENDER_EXECUTOR.submit(run_video_job, job_config, job.topic, mode).result()
         duration = time.time() - start_time
 
         # Stop progress simulation
+        job.stop_stages()
         job.status = "finalizing"
 
-        # Find the video file
-        video_path = None
-
-        if result.get("status") == "success":
-            # Parse output for video path
-            output_text = result.get("agent_output", "")
-
-            # Look for video paths in the output
-            import re
-            video_patterns = [
-                r'"video_with_music":\s*"([^"]+)"',
-                r'"video_path":\s*"([^"]+)"',
-                r'Video:\s*([^\s]+\.mp4)',
-                r'File:\s*([^\s]+\.mp4)'
-            ]
-
-            for pattern in video_patterns:
-                matches = re.findall(pattern, output_text)
-                if matches:
-                    for match in reversed(matches):  # Check latest mentions first
-                        if os.path.exists(match):
-                            video_path = match
-                            break
-                if video_path:
-                    break
-
-        # If not found in output, check output directory
-        if not video_path:
-            output_dir = "./output"
-            if os.path.exists(output_dir):
-                # Get all MP4 files created after job start
-                candidates = []
-                for f in os.listdir(output_dir):
-                    if f.endswith('.mp4'):
-                        file_path = os.path.join(output_dir, f)
-                        file_time = datetime.fromtimestamp(os.path.getmtime(file_path))
-                        if file_time >= creation_timestamp:
-                            candidates.append((file_path, file_time, 'music' in f))
-
-                if candidates:
-                    # Sort by: prefer files with 'music' in name, then by newest
-                    candidates.sort(key=lambda x: (x[2], x[1]), reverse=True)
-                    video_path = candidates[0][0]
+        video_path = _find_video_path(job_config, result, creation_timestamp)
 
         if video_path and os.path.exists(video_path):
             job.video_path = os.path.abspath(video_path)
-            job.status = "completed"
             job.progress = 100
             job.completed_at = datetime.now()
 
             # Get file info
             size_mb = os.path.getsize(job.video_path) / (1024 * 1024)
-            job.update_progress("Video completed!", 100)
+            job.update_progress(pipeline["completed"], 100)
             job.add_log(f"Duration: {duration:.1f}s | Size: {size_mb:.1f}MB")
             job.add_log(f"File: {os.path.basename(job.video_path)}")
-            job.add_log(f"Tone: {'Humorous' if tone_value < 0.5 else 'Informative'} ({tone_value:.1f})")
+            job.add_log(pipeline["summary"](job))
+            # Status flips last so event streams closing on it have seen every log
+            job.status = "completed"
+            if job._topic_key is not None:
+                _remember_video(job)
 
             # Clear thread config
             ConfigManager.clear_config()
         else:
             # Clear thread config even on failure
             ConfigManager.clear_config()
-            raise Exception("Video file not found after creation")
+            raise Exception(pipeline["missing"])
 
     except Exception as e:
         # Make sure to clear config on error
         ConfigManager.clear_config()
-        job.status = "failed"
+        job.stop_stages()
         job.error = str(e)
         job.completed_at = datetime.now()
         job.add_log(f"Error: {str(e)}")
-        logger.error(f"Video creation failed for job {job.job_id}: {e}")
+        job.status = "failed"
+        logger.error(f"{pipeline['failed']} for job {job.job_id}: {e}")
+    finally:
+        if job._topic_key is not None:
+            with video_jobs_lock:
+                if _inflight_topics.get(job._topic_key) == job.job_id:
+                    del _inflight_topics[job._topic_key]
+        _schedule_expiry(job)
 
 
 @app.route('/')
@@ -288,11 +836,6 @@ def index():
 def upload_pdf():
     """Upload and process PDF file"""
     try:
-        # Check if PDF upload folder is configured
-        if 'PDF_UPLOAD_FOLDER' not in app.config:
-            app.config['PDF_UPLOAD_FOLDER'] = './uploads/pdfs'
-            os.makedirs(app.config['PDF_UPLOAD_FOLDER'], exist_ok=True)
-
         if 'pdf' not in request.files:
             return jsonify({"error": "No PDF file provided"}), 400
 
@@ -305,17 +848,21 @@ def upload_pdf():
 
         # Save uploaded file
         filename = secure_filename(file.filename)
-        timestamp = str(int(time.time()))
-        unique_filename = f"{timestamp}_{filename}"
-
-        # Ensure upload folder exists
-        upload_folder = app.config['PDF_UPLOAD_FOLDER']
-        os.makedirs(upload_folder, exist_ok=True)
+        unique_filename = f"{int(time.time())}_{filename}"
 
-        file_path = os.path.join(upload_folder, unique_filename)
+        file_path = os.path.join(app.config['PDF_UPLOAD_FOLDER'], unique_filename)
 
         logger.info(f"Saving PDF to: {file_path}")
-        file.save(file_path)
+        # Hash while writing so the extraction cache needs no second read of the file
+        digest = hashlib.sha256()
+        with open(file_path, 'wb') as out:
+            while True:
+                chunk = file.stream.read(_UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                out.write(chunk)
+        pdf_sha256 = digest.hexdigest()
 
         # Verify file was saved
         if not os.path.exists(file_path):
@@ -323,17 +870,24 @@ def upload_pdf():
 
         # Extract text from PDF
         pdf_tool = PDFExtractionTool()
-        extracted_text = pdf_tool._extract_pdf_local(file_path)
+        extracted_text = pdf_tool._extract_pdf_local(file_path, sha256=pdf_sha256)
 
         if extracted_text.startswith("Error"):
             return jsonify({"error": extracted_text}), 500
 
+        # Keep the full text next to the PDF; the response only carries a preview
+        text_path = f"{file_path}.txt"
+        with open(text_path, 'w', encoding='utf-8') as out:
+            out.write(extracted_text)
+        _remember_pdf_text(file_path, text_path)
+
         # Store PDF info for video creation
         pdf_info = {
             "filename": filename,
             "file_path": file_path,
-            "extracted_text": extracted_text[:5000],  # Limit for response
+            "extracted_text_path": text_path,
             "text_length": len(extracted_text),
+            "sha256": pdf_sha256,
             "upload_time": datetime.now().isoformat()
         }
 
@@ -357,7 +911,9 @@ def create_video_from_pdf():
     pdf_path = data.get('pdf_path', '').strip()
     settings = data.get('settings', {})
 
-    if not pdf_path or not os.path.exists(pdf_path):
+    # Only PDFs uploaded through /api/upload-pdf may be turned into videos
+    pdf_path = _resolve_uploaded_pdf(pdf_path) if pdf_path else None
+    if not pdf_path:
         return jsonify({"error": "PDF file not found"}), 400
 
     # Validate settings (same as create_video)
@@ -370,22 +926,31 @@ def create_video_from_pdf():
     topic = f"PDF Summary: {pdf_filename}"
 
     # FIXED: Create new job with PDF settings properly configured
-    job_id = str(uuid.uuid4())
+    job_id = uuid.uuid4().hex
     job_settings = settings.copy()
     job_settings['pdf_mode'] = True
     job_settings['pdf_path'] = pdf_path  # Store PDF path in settings
+    with _pdf_text_paths_lock:
+        job_settings['pdf_text_path'] = _pdf_text_paths.get(pdf_path)  # Text extracted at upload, if known
 
     job = VideoCreationJob(job_id, topic, job_settings)
-    video_jobs[job_id] = job
 
     # Log PDF processing
-    logger.info(f"Creating video from PDF: {pdf_filename}")
     job.add_log(f"PDF Mode: Processing {pdf_filename}")
     job.add_log(f"Settings - Tone: {tone:.2f} ({'Humorous' if tone < 0.5 else 'Informative'})")
+    job.add_log("Queued for processing")
+
+    # The queue limit, store and submit happen under one lock so concurrent requests can't overfill the queue
+    with video_jobs_lock:
+        queue_full = _queued_job_count() >= _MAX_QUEUED_JOBS
+        if not queue_full:
+            _store_job(job)
+            _submit_job(job, "pdf")
 
-    # FIXED: Start PDF video creation with the corrected function
-    thread = threading.Thread(target=create_pdf_video_with_progress, args=(job,))
-    thread.start()
+    if queue_full:
+        return _queue_full_response()
+
+    logger.info(f"Creating video from PDF: {pdf_filename}")
 
     return jsonify({
         "job_id": job_id,
@@ -395,144 +960,6 @@ def create_video_from_pdf():
     })
 
 
-def create_pdf_video_with_progress(job: VideoCreationJob):
-    """FIXED: Create video from PDF with proper progress tracking"""
-    try:
-        job.status = "initializing"
-        job.update_progress("Initializing PDF video creation", 5)
-
-        # FIXED: Create config with PDF mode and path
-        job_config = Config(topic=job.topic, job_id=job.job_id, settings=job.settings)
-        ConfigManager.set_config(job_config)
-
-        # FIXED: Initialize manager with PDF mode
-        manager = ManagerAgent(mode="pdf")
-        job.update_progress("PDF analysis system initialized", 10)
-
-        job.status = "processing"
-        creation_timestamp = datetime.now()
-
-        # Get PDF path from settings
-        pdf_path = job.settings.get('pdf_path')
-        if not pdf_path or not os.path.exists(pdf_path):
-            raise Exception("PDF file not found in job settings")
-
-        job.update_progress("Extracting text from PDF", 20)
-
-        # Extract PDF text using the tool
-        pdf_tool = PDFExtractionTool()
-        extracted_text = pdf_tool._extract_pdf_local(pdf_path)
-
-        if extracted_text.startswith("Error"):
-            raise Exception(f"PDF extraction failed: {extracted_text}")
-
-        job.add_log(f"Extracted {len(extracted_text)} characters from PDF")
-
-        # Simulate progress stages for PDF processing
-        def simulate_pdf_progress():
-            stages = [
-                (30, "Analyzing PDF content structure"),
-                (40, "Identifying key concepts and themes"),
-                (50, "Creating engaging summary script"),
-                (60, "Generating AI narration"),
-                (70, "Processing video templates"),
-                (80, "Adding dynamic subtitles"),
-                (90, "Adding background music"),
-                (95, "Finalizing PDF summary video")
-            ]
-
-            start = time.time()
-            for target_progress, stage in stages:
-                if job.status != "processing":
-                    break
-                wait_time = (target_progress / 100) * 120 - (time.time() - start)
-                if wait_time > 0:
-                    time.sleep(min(wait_time, 8))
-                if job.status == "processing":
-                    job.update_progress(stage, target_progress)
-
-        # Start progress simulation
-        progress_thread = threading.Thread(target=simulate_pdf_progress)
-        progress_thread.daemon = True
-        progress_thread.start()
-
-        # FIXED: Create video from PDF using the manager agent
-        pdf_filename = os.path.basename(pdf_path)
-
-        # The manager agent will handle PDF extraction internally
-        # Just pass the topic, the PDF path is already in the config
-        start_time = time.time()
-        result = manager.create_viral_video(topic=job.topic)
-        duration = time.time() - start_time
-
-        job.status = "finalizing"
-
-        # Find the video file (same logic as regular video creation)
-        video_path = None
-
-        if result.get("status") == "success":
-            output_text = result.get("agent_output", "")
-
-            # Look for video paths in output
-            import re
-            video_patterns = [
-                r'"video_with_music":\s*"([^"]+)"',
-                r'"video_path":\s*"([^"]+)"',
-                r'Video:\s*([^\s]+\.mp4)',
-                r'File:\s*([^\s]+\.mp4)'
-            ]
-
-            for pattern in video_patterns:
-                matches = re.findall(pattern, output_text)
-                if matches:
-                    for match in reversed(matches):
-                        if os.path.exists(match):
-                            video_path = match
-                            break
-                if video_path:
-                    break
-
-        # Fallback: check output directory
-        if not video_path:
-            output_dir = "./output"
-            if os.path.exists(output_dir):
-                candidates = []
-                for f in os.listdir(output_dir):
-                    if f.endswith('.mp4'):
-                        file_path = os.path.join(output_dir, f)
-                        file_time = datetime.fromtimestamp(os.path.getmtime(file_path))
-                        if file_time >= creation_timestamp:
-                            candidates.append((file_path, file_time, 'music' in f))
-
-                if candidates:
-                    candidates.sort(key=lambda x: (x[2], x[1]), reverse=True)
-                    video_path = candidates[0][0]
-
-        if video_path and os.path.exists(video_path):
-            job.video_path = os.path.abspath(video_path)
-            job.status = "completed"
-            job.progress = 100
-            job.completed_at = datetime.now()
-
-            size_mb = os.path.getsize(job.video_path) / (1024 * 1024)
-            job.update_progress("PDF video completed!", 100)
-            job.add_log(f"Duration: {duration:.1f}s | Size: {size_mb:.1f}MB")
-            job.add_log(f"Source: {os.path.basename(pdf_path)}")
-
-            ConfigManager.clear_config()
-        else:
-            ConfigManager.clear_config()
-            raise Exception("PDF video file not found after creation")
-
-    except Exception as e:
-        ConfigManager.clear_config()
-        job.status = "failed"
-        job.error = str(e)
-        job.completed_at = datetime.now()
-        job.add_log(f"Error: {str(e)}")
-        logger.error(f"PDF video creation failed for job {job.job_id}: {e}")
-
-
 @app.route('/api/create', methods=['POST'])
 def create_video():
     """Start video creation job with enhanced settings support"""
@@ -557,24 +984,66 @@ def create_video():
         if not isinstance(model, str) or len(model.strip()) == 0:
             return jsonify({"error": f"Invalid model for {agent}"}), 400
 
-    # Create new job with settings
-    job_id = str(uuid.uuid4())
+    # Identical request already rendering or recently rendered: reuse it instead of rendering twice
+    topic_key = _topic_key(topic, settings)
+    job_id = uuid.uuid4().hex
     job = VideoCreationJob(job_id, topic, settings)
-    video_jobs[job_id] = job
+    job._topic_key = topic_key
 
-    # Log settings
-    logger.info(f"Creating video for '{topic}' with settings: {settings}")
+    # Log settings (on a job that is dropped again if the request is coalesced)
     job.add_log(f"Settings - Tone: {tone:.2f} ({'Humorous' if tone < 0.5 else 'Informative'})")
 
     # Log model settings if custom
-    models = settings.get('models', {})
     custom_models = {k: v for k, v in models.items() if v not in ['gemma3:12b', 'qwen3:30b']}
     if custom_models:
         job.add_log(f"Custom Models: {', '.join([f'{k}={v}' for k, v in custom_models.items()])}")
+    job.add_log("Queued for processing")
+
+    # Coalescing, the queue limit and the submit happen under one lock so concurrent
+    # requests can neither render the same topic twice nor overfill the queue
+    with video_jobs_lock:
+        inflight_id = _inflight_topics.get(topic_key)
+        finished_path = _finished_topics.get(topic_key)
+        queue_full = False
+        if not inflight_id and not (finished_path and os.path.exists(finished_path)):
+            finished_path = None
+            # Only requests that need a new render are subject to back-pressure
+            queue_full = _queued_job_count() >= _MAX_QUEUED_JOBS
+            if not queue_full:
+                _store_job(job)
+                _inflight_topics[topic_key] = job_id
+                _submit_job(job, "tiktok")
+
+    if queue_full:
+        return _queue_full_response()
+
+    if inflight_id:
+        return jsonify({
+            "job_id": inflight_id,
+            "message": "Identical video creation already in progress",
+            "topic": topic,
+            "settings": settings
+        })
+
+    if finished_path:
+        reused = VideoCreationJob(job_id, topic, settings)
+        reused._topic_key = topic_key
+        reused.video_path = finished_path
+        reused.status = "completed"
+        reused.completed_at = datetime.now()
+        reused.update_progress("Video completed!", 100)
+        reused.add_log("Reused the video from an identical recent request")
+        with video_jobs_lock:
+            _store_job(reused)
+        _schedule_expiry(reused)
+        return jsonify({
+            "job_id": job_id,
+            "message": "Video reused from an identical recent request",
+            "topic": topic,
+            "settings": settings
+        })
 
-    # Start video creation in background
-    thread = threading.Thread(target=create_video_with_progress, args=(job,))
-    thread.start()
+    logger.info(f"Creating video for '{topic}' with settings: {settings}")
 
     return jsonify({
         "job_id": job_id,
@@ -587,18 +1056,77 @@ def create_video():
 @app.route('/api/status/<job_id>')
 def get_status(job_id):
     """Get status of video creation job"""
-    job = video_jobs.get(job_id)
+    job = _get_job(job_id)
 
     if not job:
         return jsonify({"error": "Job not found"}), 404
 
-    return jsonify(job.to_dict())
+    # Clients pass back logs_next as ?since= to receive only new log entries
+    since = request.args.get('since', 0, type=int)
+
+    # Unchanged job since the client's last poll: answer 304 without building a body
+    version = job._version
+    etag = f"{version}-{since}"
+
+    # Long polling: with ?wait=N an unchanged job holds the request up to N seconds for a change
+    wait = min(max(request.args.get('wait', 0, type=float), 0), _LONG_POLL_MAX_WAIT)
+    if wait and request.if_none_match.contains_weak(etag):
+        etag = f"{job.wait_for_change(version, timeout=wait)}-{since}"
+
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+    elif since > 0:
+        response = jsonify(job.to_dict(since))
+    else:
+        response = app.response_class(job.to_json(), mimetype='application/json')
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+@app.route('/api/events/<job_id>')
+def stream_job_events(job_id):
+    """Push job updates as Server-Sent Events until the job completes or fails"""
+    job = _get_job(job_id)
+
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+
+    def generate():
+        version = job._version
+        since = 0
+        while True:
+            # Each event carries only the log entries added since the previous one
+            data = job.to_dict(since)
+            since = data["logs_next"]
+            yield f"data: {app.json.dumps(data)}\n\n"
+            if data["status"] in ("completed", "failed"):
+                return
+
+            current = job.wait_for_change(version, timeout=15)
+            while current == version:
+                yield ": keep-alive\n\n"
+                current = job.wait_for_change(version, timeout=15)
+            version = current
+
+    return app.response_class(generate(), mimetype='text/event-stream',
+                              headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+def _attachment_filename(filename: str) -> Dict[str, str]:
+    """Content-Disposition filename parameters, with an ASCII fallback for non-ASCII names (as send_file does)"""
+    try:
+        filename.encode('ascii')
+    except UnicodeEncodeError:
+        simple = unicodedata.normalize('NFKD', filename).encode('ascii', 'ignore').decode('ascii')
+        return {"filename": simple, "filename*": f"UTF-8''{quote(filename, safe='!#$&+-.^_`|~')}"}
+    return {"filename": filename}
 
 
 @app.route('/api/download/<job_id>')
 def download_video(job_id):
     """Download the created video"""
-    job = video_jobs.get(job_id)
+    job = _get_job(job_id)
 
     if not job:
         return jsonify({"error": "Job not found"}), 404
@@ -613,41 +1141,36 @@ def download_video(job_id):
         logger.error(f"Video file not found at: {video_file}")
         return jsonify({"error": f"Video file not found at: {video_file}"}), 404
 
-    # Generate filename based on topic, settings and job ID
-    safe_topic = "".join(c for c in job.topic if c.isalnum() or c in (' ', '-', '_')).rstrip()
-    safe_topic = safe_topic[:50]  # Limit length
-    timestamp = job.created_at.strftime("%Y%m%d_%H%M%S")
-
-    # Add tone and model info to filename
-    tone_value = job.settings.get('tone', 0.5)
-    tone_suffix = "humorous" if tone_value < 0.5 else "informative"
-
-    # Add model info if custom models are used
-    models = job.settings.get('models', {})
-    custom_models = {k: v for k, v in models.items() if v not in ['gemma3:12b', 'qwen3:30b']}
-    model_suffix = ""
-    if custom_models:
-        model_names = [v.split(':')[0] for v in custom_models.values()]
-        model_suffix = f"_{'_'.join(set(model_names))}"
-
-    filename = f"tiktok_{safe_topic}_{tone_suffix}{model_suffix}_{timestamp}.mp4"
+    filename = job.download_filename
 
     logger.info(f"Serving video file: {video_file} as {filename}")
 
+    if _ACCEL_REDIRECT_PREFIX:
+        response = make_response('')
+        response.headers['X-Accel-Redirect'] = _ACCEL_REDIRECT_PREFIX + os.path.basename(video_file)
+        response.headers['Content-Type'] = 'video/mp4'
+        response.headers.set('Content-Disposition', 'attachment', **_attachment_filename(filename))
+        return response
+
     return send_file(
         video_file,
         as_attachment=True,
         download_name=filename,
-        mimetype='video/mp4'
+        mimetype='video/mp4',
+        conditional=True
     )
 
 
 @app.route('/api/ollama/models')
 def get_ollama_models():
     """Get available Ollama models"""
+    global _ollama_models_cache
+    cached = _ollama_models_cache
+    if cached and cached[0] > time.monotonic():
+        return jsonify(cached[1])
+
     try:
-        import requests
-        response = requests.get("http://localhost:11434/api/tags", timeout=10)
+        response = _OLLAMA_SESSION.get("http://localhost:11434/api/tags", timeout=10)
 
         if response.status_code == 200:
             data = response.json()
@@ -661,11 +1184,13 @@ def get_ollama_models():
 
             models.sort()  # Sort alphabetically
 
-            return jsonify({
+            payload = {
                 "models": models,
                 "count": len(models),
                 "status": "success"
-            })
+            }
+            _ollama_models_cache = (time.monotonic() + _OLLAMA_MODELS_TTL, payload)
+            return jsonify(payload)
         else:
             return jsonify({
                 "error": f"Ollama API returned status {response.status_code}",
@@ -690,43 +1215,36 @@ def get_ollama_models():
 
 @app.route('/api/jobs')
 def list_jobs():
-    """List all video creation jobs"""
-    jobs_list = [job.to_dict() for job in video_jobs.values()]
-    # Sort by creation date, newest first
-    jobs_list.sort(key=lambda x: x['created_at'], reverse=True)
-    return jsonify(jobs_list)
+    """List the most recent video creation jobs, newest first, without their logs"""
+    limit = request.args.get('limit', 50, type=int)
+    with video_jobs_lock:
+        # Jobs are stored in creation order, so the newest are at the end
+        jobs = list(islice(reversed(video_jobs.values()), max(limit, 0)))
+
+    # Any job change bumps its version, so the listed ids and versions identify the body
+    # (hashed with blake2b rather than hash(), which is salted per process and would
+    # give each worker its own tag for the same list)
+    digest = hashlib.blake2b(digest_size=16)
+    for job in jobs:
+        digest.update(f"{job.job_id}:{job._version};".encode())
+    etag = digest.hexdigest()
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+    else:
+        response = jsonify([job.to_summary_dict() for job in jobs])
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = 'no-cache'
+    queued = _queued_job_count()
+    response.headers['X-Queue-Depth'] = str(queued)
+    response.headers['X-Running-Jobs'] = str(max(len(_job_futures) - queued, 0))
+    return response
 
 
 @app.route('/api/cleanup', methods=['POST'])
 def cleanup_old_videos():
-    """Clean up old video files and jobs"""
-    try:
-        cleaned = 0
-        # Remove completed jobs older than 1 hour
-        current_time = datetime.now()
-        jobs_to_remove = []
-
-        for job_id, job in video_jobs.items():
-            if job.completed_at:
-                age = current_time - job.completed_at
-                if age.total_seconds() > 3600:  # 1 hour
-                    jobs_to_remove.append(job_id)
-                    # Delete video file if exists
-                    if job.video_path and os.path.exists(job.video_path):
-                        os.remove(job.video_path)
-                        cleaned += 1
-
-        # Remove jobs from memory
-        for job_id in jobs_to_remove:
-            del video_jobs[job_id]
-
-        return jsonify({
-            "message": f"Cleaned up {cleaned} old videos",
-            "removed_jobs": len(jobs_to_remove)
-        })
-
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    """Ask the cleanup thread to remove jobs and videos older than 1 hour now"""
+    _cleanup_wakeup.set()
+    return jsonify({"message": "Cleanup of videos older than 1 hour started"}), 202
 
 
 def initialize_system() -> ManagerAgent:
@@ -775,5 +1293,5 @@ if __name__ == '__main__':
     print("The original CLI tool (main.py) can still be used independently")
     print("=" * 50)
 
-    # Run Flask app
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    # Run Flask app (threaded so status polls and downloads don't queue behind each other)
+    app.run(debug=os.environ.get("RR_DEBUG") == "1", host='0.0.0.0', port=5000, threaded=True)
\ No newline at end of file